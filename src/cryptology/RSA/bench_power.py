@@ -0,0 +1,85 @@
+"""
+
+Benchmark of the modular exponentiation of rsa.py.
+
+usage:
+    python bench_power.py                   # moduli of 1024 and 2048 bits
+    python bench_power.py -b 512 4096 -o results.json
+
+Each case raises a random number to a random exponent of the size of the modulus.
+The result of a case is the best time of one exponentiation in seconds.
+"""
+import argparse
+import json
+import random
+import sys
+import timeit
+
+from core import modexp, rsa
+
+
+def binary_power_mod(base, e, m):
+    """
+
+    The right-to-left binary exponentiation rsa.power_mod used before the sliding windows.
+    """
+    result = 1
+    b = base % m
+    while e > 0:
+        if e & 1 == 1:
+            result = result * b % m
+        e >>= 1
+        b = b**2 % m
+    return result
+
+
+def run(bits=(1024, 2048), repeat=5, seed=0):
+    """
+
+    :type bits: iterable
+    :rtype: dict
+
+    The results are keyed by "name/bits".
+    """
+    rng = random.Random(seed)
+    results = {}
+    for size in bits:
+        m = rng.getrandbits(size) | (1 << (size - 1)) | 1
+        base, e = rng.getrandbits(size - 1), rng.getrandbits(size)
+        plain = modexp.PowerContext(m)
+        montgomery = modexp.PowerContext(m, montgomery=True)
+        cases = {
+            "binary": lambda: binary_power_mod(base, e, m),
+            "power_mod": lambda: rsa.power_mod(base, e, m),
+            "context": lambda: plain.power(base, e),
+            "montgomery": lambda: montgomery.power(base, e),
+            "pow": lambda: pow(base, e, m),
+        }
+        for name, statement in cases.items():
+            timer = timeit.Timer(statement)
+            number, _ = timer.autorange()
+            results["{0}/{1}".format(name, size)] = min(timer.repeat(repeat, number))/number
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the modular exponentiation of rsa.py.")
+    parser.add_argument("-b", "--bits", type=int, nargs='+', default=(1024, 2048))
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run(args.bits, args.repeat)
+    for size in args.bits:
+        reference = results["pow/{0}".format(size)]
+        for name in ("binary", "power_mod", "context", "montgomery", "pow"):
+            seconds = results["{0}/{1}".format(name, size)]
+            print("{0:<20}{1:.6e}  {2:.2f}x pow".format("{0}/{1}".format(name, size), seconds, seconds/reference))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+def window_size(bits):
+    """
+
+    :type bits: int
+
+    Get the size of the windows for an exponent of the given number of bits, which
+    balances the precomputed odd powers against the multiplications saved.
+    """
+    if bits > 671:
+        return 6
+    if bits > 239:
+        return 5
+    if bits > 79:
+        return 4
+    if bits > 23:
+        return 3
+    return 1
+
+
+def schedule(e, k):
+    """
+
+    :type e: int
+    :type k: int
+
+    Split the exponent e into sliding windows of at most k bits, each one starting and
+    ending with a 1. Get the list of (squarings, index) of the windows from the highest
+    one, where index is the index of the window in the odd powers (value // 2) and
+    squarings the number of squarings before multiplying by it, and the number of the
+    squarings after the last window.
+    """
+    bits = bin(e)[2:]
+    steps = []
+    i, n, zeros = 0, len(bits), 0
+    while i < n:
+        if bits[i] == '0':
+            zeros += 1
+            i += 1
+            continue
+        j = min(i + k, n) - 1
+        while bits[j] == '0':
+            j -= 1
+        steps.append((zeros + j - i + 1, int(bits[i: j+1], 2) >> 1))
+        zeros = 0
+        i = j + 1
+    return steps, zeros
+
+
+class PowerContext(object):
+    """
+
+    :type n: int
+
+    Modular exponentiations under the modulus n by sliding windows. The constants of n are
+    computed once, the windows of the last exponent are kept for the next exponentiations
+    by the same exponent. Nothing is shared between the contexts, so that the private
+    exponents and primes go away with the contexts using them.
+    If montgomery is True (n odd), the products are reduced by Montgomery reduction,
+    shifts and masks instead of divisions. In CPython the division of big integers runs
+    in C, so it is usually faster without it.
+    """
+
+    def __init__(self, n, montgomery=False):
+        self.n = n
+        self.montgomery = montgomery
+        # (e, k, steps, zeros) of the last exponent.
+        self._windows = None
+        if montgomery:
+            if n % 2 == 0:
+                raise ValueError("Montgomery reduction needs an odd modulus")
+            self.shift = n.bit_length()
+            self.mask = (1 << self.shift) - 1
+            # n*n_prime = -1 (mod 2**shift)
+            self.n_prime = -pow(n, -1, 1 << self.shift) & self.mask
+
+    def _reduce(self, t):
+        """
+
+        Get t / 2**shift mod n for t < n*2**shift (Montgomery reduction).
+        """
+        u = (t + ((t & self.mask) * self.n_prime & self.mask) * self.n) >> self.shift
+        return u - self.n if u >= self.n else u
+
+    def power(self, base, e):
+        """
+
+        :type base: int
+        :type e: int
+
+        Get base**e % n, 1 if e is not positive.
+        """
+        if not isinstance(e, int):
+            raise TypeError("<class 'int'> expected got {0}".format(type(e)))
+        if e <= 0:
+            return 1
+        if self._windows is None or self._windows[0] != e:
+            k = window_size(e.bit_length())
+            self._windows = (e, k) + schedule(e, k)
+        _, k, steps, zeros = self._windows
+        if self.montgomery:
+            return self._power_montgomery(base, steps, zeros, k)
+
+        m = self.n
+        b = base % m
+        table = [b]
+        if k > 1:
+            b2 = b * b % m
+            for _ in range((1 << (k-1)) - 1):
+                table.append(table[-1] * b2 % m)
+
+        result = table[steps[0][1]]
+        for squarings, index in steps[1:]:
+            for _ in range(squarings):
+                result = result * result % m
+            result = result * table[index] % m
+        for _ in range(zeros):
+            result = result * result % m
+        return result
+
+    def _power_montgomery(self, base, steps, zeros, k):
+        reduce = self._reduce
+        # the Montgomery form of x is x*2**shift mod n.
+        b = (base % self.n << self.shift) % self.n
+        table = [b]
+        if k > 1:
+            b2 = reduce(b * b)
+            for _ in range((1 << (k-1)) - 1):
+                table.append(reduce(table[-1] * b2))
+
+        result = table[steps[0][1]]
+        for squarings, index in steps[1:]:
+            for _ in range(squarings):
+                result = reduce(result * result)
+            result = reduce(result * table[index])
+        for _ in range(zeros):
+            result = reduce(result * result)
+        return reduce(result)
+
+
+def power_mod(base, e, m):
+    """
+
+    Get base**e % m by a new PowerContext. Nothing is cached between the calls, a
+    PowerContext reuses the windows of an exponent.
+    """
+    return PowerContext(m).power(base, e)
@@ -0,0 +1,203 @@
+import math
+import multiprocessing
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+ROUNDS = 40
+SIEVE_LIMIT = 2000
+WINDOW = 4096
+
+
+def small_primes(limit=SIEVE_LIMIT):
+    """
+
+    :type limit: int
+
+    Get the primes below limit by the sieve of Eratosthenes.
+    """
+    sieve = bytearray([1]) * limit
+    sieve[:2] = b"\x00\x00"
+    for p in range(2, math.isqrt(limit - 1) + 1):
+        if sieve[p]:
+            sieve[p*p::p] = bytes(len(range(p*p, limit, p)))
+    return [p for p in range(limit) if sieve[p]]
+
+
+SMALL_PRIMES = small_primes()
+SMALL_PRIME_SET = frozenset(SMALL_PRIMES)
+# a number sharing no factor with it has no prime factor below SIEVE_LIMIT.
+SMALL_PRIME_PRODUCT = math.prod(SMALL_PRIMES)
+
+
+def miller_rabin(n, rounds=ROUNDS, rng=random):
+    """
+
+    :type n: int
+    :type rounds: int
+
+    The Miller-Rabin test of the odd number n > 3 with rounds random bases.
+    A composite number passes it with a probability of at most 4**-rounds.
+    """
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for _ in range(rounds):
+        x = pow(rng.randrange(2, n - 1), d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_probable_prime(n, rounds=ROUNDS, rng=random):
+    """
+
+    :type n: int
+    :type rounds: int
+
+    Test n by one gcd with the product of the small primes, then by Miller-Rabin.
+    """
+    if n < SIEVE_LIMIT:
+        return n in SMALL_PRIME_SET
+    if math.gcd(n, SMALL_PRIME_PRODUCT) != 1:
+        return False
+    return miller_rabin(n, rounds, rng)
+
+
+def sieve_window(start, size=WINDOW):
+    """
+
+    :type start: int
+    :type size: int
+
+    Get the odd numbers start, start + 2, ..., start + 2*(size-1) which have no prime
+    factor below SIEVE_LIMIT, start is odd and larger than SIEVE_LIMIT.
+    """
+    candidates = bytearray([1]) * size
+    for p in SMALL_PRIMES[1:]:
+        # the index i of the first multiple of p, start + 2*i = 0 (mod p), (p+1)/2 is 1/2 mod p.
+        i = (-start) * ((p + 1) // 2) % p
+        candidates[i::p] = bytes(len(range(i, size, p)))
+    return [start + 2*i for i in range(size) if candidates[i]]
+
+
+def next_prime(n, rounds=ROUNDS, rng=random):
+    """
+
+    :type n: int
+
+    Get the smallest probable prime not less than n, the odd numbers are sieved
+    window by window before the Miller-Rabin tests.
+    """
+    if n <= SIEVE_LIMIT:
+        for p in SMALL_PRIMES:
+            if p >= n:
+                return p
+        n = SIEVE_LIMIT + 1
+    start = n | 1
+    while True:
+        for candidate in sieve_window(start):
+            if miller_rabin(candidate, rounds, rng):
+                return candidate
+        start += 2*WINDOW
+
+
+def random_rounds(bits):
+    """
+
+    :type bits: int
+
+    Get the number of Miller-Rabin rounds for a random candidate of the given number of bits.
+    4**-rounds bounds the error for any number, but a random composite number passes a round
+    far less often, so that the error stays below 2**-100 with these rounds
+    (Damgard, Landrock and Pomerance, as used by FIPS 186-4).
+    """
+    if bits >= 1024:
+        return 5
+    if bits >= 512:
+        return 8
+    if bits >= 256:
+        return 16
+    return ROUNDS
+
+
+def random_prime(bits, rounds=None, rng=None):
+    """
+
+    :type bits: int
+
+    Get a random probable prime of the given number of bits (more than 11), the two
+    highest bits set so that the product of two of them has 2*bits bits.
+    The numbers are drawn from random.SystemRandom unless rng is given, and tested by
+    random_rounds(bits) rounds unless rounds is given.
+    """
+    rng = rng or random.SystemRandom()
+    rounds = rounds or random_rounds(bits)
+    while True:
+        start = rng.getrandbits(bits) | (3 << (bits - 2)) | 1
+        for candidate in sieve_window(start):
+            if candidate.bit_length() != bits:
+                break
+            if miller_rabin(candidate, rounds, rng):
+                return candidate
+
+
+# set in the worker processes of parallel_primes to stop their searches.
+_stop = None
+
+
+def _init_worker(stop):
+    global _stop
+    _stop = stop
+
+
+def _search_prime(bits, rounds):
+    """
+
+    Search a random prime like random_prime in a worker process, None if it is stopped.
+    """
+    rng = random.SystemRandom()
+    rounds = rounds or random_rounds(bits)
+    while not _stop.is_set():
+        start = rng.getrandbits(bits) | (3 << (bits - 2)) | 1
+        for candidate in sieve_window(start):
+            if candidate.bit_length() != bits or _stop.is_set():
+                break
+            if miller_rabin(candidate, rounds, rng):
+                return candidate
+    return None
+
+
+def parallel_primes(count, bits, workers=None, rounds=None):
+    """
+
+    :type count: int
+    :type bits: int
+    :type workers: int
+
+    Get count distinct random primes like random_prime, searched by a pool of workers
+    processes (the number of CPUs if None). Every worker keeps searching, one prime at a
+    time, and all of them are stopped as soon as count primes are found.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    stop = multiprocessing.Event()
+    primes = []
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(stop,)) as pool:
+        running = {pool.submit(_search_prime, bits, rounds) for _ in range(workers)}
+        while len(primes) < count:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                p = future.result()
+                if p is not None and p not in primes and len(primes) < count:
+                    primes.append(p)
+            # the workers which found a prime start a new search while primes are missing.
+            if len(primes) < count:
+                running.update(pool.submit(_search_prime, bits, rounds) for _ in done)
+        stop.set()
+    return primes
@@ -1,6 +1,9 @@
+import os
 import time
 import random
 
+from . import modexp, primality
+
 prime_in_1000 = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73, 79, 83, 89, 97, 101,
                  103, 107, 109, 113, 127, 131, 137, 139, 149, 151, 157, 163, 167, 173, 179, 181, 191, 193, 197, 199,
                  211, 223, 227, 229, 233, 239, 241, 251, 257, 263, 269, 271, 277, 281, 283, 293, 307, 311, 313, 317,
@@ -31,38 +34,23 @@ def gcd(a, b):
 
 
 def power_mod(base, e, m):
-    result = 1
-    b = base
-    b %= m
-    while e > 0:
-        if e & 1 == 1:
-            result = result * b % m
-        e >>= 1
-        b = b**2 % m
-    return result
-
-
-def prime_test(n, test=(2, 3, 5, 13, 127, 499)):
-    for m in prime_in_1000:
-        if n % m == 0 and n not in prime_in_1000:
-            return False
-    for m in test:
-        if power_mod(m, n-1, n) == 1:
-            pass
-        else:
-            return False
-    return True
+    """
 
+    Get base**e % m by sliding windows, see modexp.PowerContext.
+    """
+    return modexp.power_mod(base, e, m)
 
-def prime_num_produce():
-    random.seed(time.time())
+
+def prime_test(n, rounds=primality.ROUNDS):
+    return primality.is_probable_prime(n, rounds)
+
+
+def prime_num_produce(bits=1024, count=2, workers=None):
+    if workers:
+        return set(primality.parallel_primes(count, bits, workers))
     prime_num = set()
-    while len(prime_num) != 2:
-        n = random.randint(2**1023, 2**1024)
-        if n % 2 == 0:
-            n += 1
-        if prime_test(n) is True:
-            prime_num.add(n)
+    while len(prime_num) != count:
+        prime_num.add(primality.random_prime(bits))
     return prime_num
 
 
@@ -97,21 +85,84 @@ def extended_euclid(a, b):
     return y2 % b
 
 
-def key_generator():
-    rsa_p, rsa_q = prime_num_produce()
+def make_key(rsa_p, rsa_q):
+    """
+
+    Generate the key of the primes p and q. The private key 'S' is
+    [d, n, p, q, dP, dQ, qInv] so that decryption can use the CRT.
+    """
     rsa_n = rsa_q * rsa_p
     phi_n = (rsa_p-1) * (rsa_q-1)
     rsa_e = produce_e(phi_n)
     rsa_d = extended_euclid(rsa_e, phi_n)
-    return {'P': [rsa_e, rsa_n], 'S': [rsa_d, rsa_n]}
+    crt = [rsa_p, rsa_q, rsa_d % (rsa_p-1), rsa_d % (rsa_q-1), extended_euclid(rsa_q, rsa_p)]
+    return {'P': [rsa_e, rsa_n], 'S': [rsa_d, rsa_n] + crt}
+
+
+def key_generator(count=None, workers=None, bits=1024):
+    """
+
+    Generate a key of two primes of the given bits, or a list of count keys.
+    The primes are searched by a pool of workers processes if workers is given.
+    """
+    if count is None:
+        return make_key(*prime_num_produce(bits, 2, workers))
+    primes = list(prime_num_produce(bits, 2*count, workers))
+    return [make_key(primes[i], primes[i+1]) for i in range(0, 2*count, 2)]
 
 
 def encryption(message, e, n):
-    return map(lambda x: power_mod(x, e, n), message)
+    """
+
+    Encrypt the values of message with the public key, e.g. encryption(message, *key['P']).
+    The windows of e are computed once for all the values, like decryption.
+    """
+    context = modexp.PowerContext(n)
+    return map(lambda x: context.power(x, e), message)
 
 
-def decryption(c, d, n):
-    return map(lambda x: power_mod(x, d, n), c)
+def crt_power_mod(x, p, q, dp, dq, q_inv, contexts=None):
+    """
+
+    Get x**d % (p*q) by the Chinese Remainder Theorem, two exponentiations of half the
+    size with dp = d % (p-1), dq = d % (q-1) and q_inv = q**-1 % p (Garner's formula).
+    contexts are the modexp.PowerContext of p and q shared by the calls, new ones if None.
+    """
+    p_context, q_context = contexts or (modexp.PowerContext(p), modexp.PowerContext(q))
+    m1 = p_context.power(x, dp)
+    m2 = q_context.power(x, dq)
+    h = q_inv * (m1 - m2) % p
+    return m2 + h * q
+
+
+def decryption(c, d, n, p=None, q=None, dp=None, dq=None, q_inv=None):
+    """
+
+    Decrypt the values of c, with the CRT if p, q, dp, dq and q_inv are given,
+    e.g. decryption(c, *key['S']). The windows of the exponents are computed once for
+    all the values, by contexts which only live as long as the result.
+    """
+    if p is None:
+        context = modexp.PowerContext(n)
+        return map(lambda x: context.power(x, d), c)
+    contexts = modexp.PowerContext(p), modexp.PowerContext(q)
+    return map(lambda x: crt_power_mod(x, p, q, dp, dq, q_inv, contexts), c)
+
+
+def sign(message, d, n, *crt):
+    """
+
+    Sign the values of message with the private key, e.g. sign(message, *key['S']).
+    """
+    return decryption(message, d, n, *crt)
+
+
+def verify(message, signature, e, n):
+    """
+
+    Check the signature of the values of message with the public key.
+    """
+    return list(message) == list(encryption(signature, e, n))
 
 
 def text_to_ascii(text):
@@ -119,3 +170,102 @@ def text_to_ascii(text):
     for ch in text:
         tmp.append(ord(ch))
     return tmp
+
+
+def _key_size(n):
+    return (n.bit_length() + 7) // 8
+
+
+def _chunks(source, size):
+    """
+
+    Generate the chunks of size bytes of a bytes-like object or a file-like object,
+    the last one may be shorter. A bytes-like object is sliced by a memoryview without copies.
+    A file is read until the chunk is full or the end of the file, as a raw file may
+    return fewer bytes than asked.
+    """
+    if hasattr(source, "read"):
+        while True:
+            chunk = source.read(size)
+            if not chunk:
+                return
+            while len(chunk) < size:
+                more = source.read(size - len(chunk))
+                if not more:
+                    break
+                chunk += more
+            yield memoryview(chunk)
+    else:
+        view = memoryview(source).cast('B')
+        for i in range(0, len(view), size):
+            yield view[i: i+size]
+
+
+def _pad(block, k):
+    """
+
+    Pad the block to k bytes, 0x00 0x02 nonzero random bytes 0x00 block (PKCS #1 v1.5).
+    """
+    size = k - 3 - len(block)
+    padding = b""
+    while len(padding) < size:
+        padding += os.urandom(size - len(padding)).replace(b"\x00", b"")
+    return b"\x00\x02" + padding + b"\x00" + block
+
+
+def _unpad(block):
+    i = block.find(b"\x00", 2)
+    if block[:2] != b"\x00\x02" or i < 10:
+        raise ValueError("decryption error")
+    return block[i+1:]
+
+
+def encrypt_stream(source, e, n, chunk_blocks=64):
+    """
+
+    Encrypt the bytes of source, a bytes-like object or a file-like object read by chunks of
+    chunk_blocks blocks. Each block of up to k-11 bytes, k the size of n in bytes, is padded
+    and encrypted to k bytes, which are generated block by block,
+    e.g. target.writelines(encrypt_stream(source, *key['P'])).
+    """
+    k = _key_size(n)
+    size = k - 11
+    if size <= 0:
+        raise ValueError("the modulus is too small")
+    # the windows of e are computed once for all the blocks, as in decryption.
+    context = modexp.PowerContext(n)
+    for chunk in _chunks(source, size*chunk_blocks):
+        for i in range(0, len(chunk), size):
+            x = int.from_bytes(_pad(bytes(chunk[i: i+size]), k), 'big')
+            yield context.power(x, e).to_bytes(k, 'big')
+
+
+def decrypt_stream(source, d, n, *crt, chunk_blocks=64):
+    """
+
+    Decrypt the blocks made by encrypt_stream, crt are the other items of the private key
+    like decryption. The bytes of each block are generated in turn.
+    """
+    k = _key_size(n)
+    for chunk in _chunks(source, k*chunk_blocks):
+        if len(chunk) % k:
+            raise ValueError("the ciphertext isn't made of blocks of {0} bytes".format(k))
+        values = [int.from_bytes(chunk[i: i+k], 'big') for i in range(0, len(chunk), k)]
+        for x in decryption(values, d, n, *crt):
+            yield _unpad(x.to_bytes(k, 'big'))
+
+
+def encrypt_bytes(data, e, n):
+    """
+
+    Encrypt bytes, see encrypt_stream.
+    """
+    return b"".join(encrypt_stream(data, e, n))
+
+
+def decrypt_bytes(data, d, n, *crt):
+    """
+
+    Decrypt bytes made by encrypt_bytes.
+    """
+    return b"".join(decrypt_stream(data, d, n, *crt))
@@ -1,5 +1,7 @@
+import io
+import random
 import unittest
-from core import rsa
+from core import modexp, primality, rsa
 
 
 class Testrsa(unittest.TestCase):
@@ -14,12 +16,95 @@ class Testrsa(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.assertEqual(rsa.power_mod(2, 0.5, 7), 0)
 
+    def test_modexp(self):
+        for bits in (8, 64, 300, 1024):
+            m = random.getrandbits(bits) | 1
+            base, e = random.getrandbits(bits + 5), random.getrandbits(bits)
+            self.assertEqual(rsa.power_mod(base, e, m), pow(base, e, m))
+            context = modexp.PowerContext(m, montgomery=True)
+            self.assertEqual(context.power(base, e), pow(base, e, m))
+            self.assertEqual(context.power(base, 2**bits), pow(base, 2**bits, m))
+        self.assertEqual(rsa.power_mod(5, 0, 7), 1)
+        self.assertEqual(rsa.power_mod(5, 3, 1), 0)
+        self.assertEqual(modexp.schedule(0b1011000101, 3), ([(3, 2), (1, 0), (6, 2)], 0))
+        with self.assertRaises(ValueError):
+            modexp.PowerContext(10, montgomery=True)
+
     def test_prime_test(self):
         self.assertTrue(rsa.prime_test(4567))
         self.assertTrue(rsa.prime_test(7))
         self.assertTrue(rsa.prime_test(997))
         self.assertFalse(rsa.prime_test(4))
         self.assertFalse(rsa.prime_test(4666))
+        self.assertTrue(rsa.prime_test(2**127 - 1))
+        # Carmichael numbers pass the Fermat test of any base coprime to them.
+        self.assertFalse(rsa.prime_test(41041))
+        self.assertFalse(rsa.prime_test(3215031751))
+        self.assertFalse(rsa.prime_test((2**61 - 1)*(2**89 - 1)))
+
+    def test_primality(self):
+        self.assertEqual(primality.small_primes(1000), rsa.prime_in_1000)
+        self.assertEqual(primality.next_prime(2**64), 2**64 + 13)
+        self.assertEqual(primality.next_prime(14), 17)
+        window = primality.sieve_window(2**64 + 1, 100)
+        self.assertIn(2**64 + 13, window)
+        self.assertTrue(all(n % 3 and n % 1999 for n in window))
+        p = primality.random_prime(256)
+        self.assertEqual(p.bit_length(), 256)
+        self.assertTrue(primality.miller_rabin(p, 10))
+
+    def test_parallel(self):
+        primes = primality.parallel_primes(3, 256, workers=2)
+        self.assertEqual(len(set(primes)), 3)
+        self.assertTrue(all(p.bit_length() == 256 and rsa.prime_test(p) for p in primes))
+        keys = rsa.key_generator(count=2, workers=2, bits=256)
+        self.assertEqual(len(keys), 2)
+        for key in keys:
+            e, n = key['P']
+            d = key['S'][0]
+            self.assertEqual(rsa.power_mod(rsa.power_mod(42, e, n), d, n), 42)
+
+    def test_crt(self):
+        key = rsa.make_key(1000003, 999983)
+        d, n, p, q, dp, dq, q_inv = key['S']
+        self.assertEqual((p, q), (1000003, 999983))
+        self.assertEqual(q * q_inv % p, 1)
+        values = [0, 1, 42, n - 1]
+        for x in values:
+            self.assertEqual(rsa.crt_power_mod(x, p, q, dp, dq, q_inv), pow(x, d, n))
+        self.assertEqual(list(rsa.decryption(values, *key['S'])), list(rsa.decryption(values, d, n)))
+        signature = list(rsa.sign(values, *key['S']))
+        self.assertTrue(rsa.verify(values, signature, *key['P']))
+        self.assertFalse(rsa.verify([43], signature[2:3], *key['P']))
+
+    def test_bytes(self):
+        key = rsa.key_generator(bits=256)
+        data = bytes(range(256))*5
+        cipher = rsa.encrypt_bytes(data, *key['P'])
+        self.assertEqual(len(cipher), 64*-(-len(data)//53))
+        self.assertEqual(rsa.decrypt_bytes(cipher, *key['S']), data)
+        self.assertEqual(rsa.decrypt_bytes(memoryview(cipher), *key['S'][:2]), data)
+        self.assertEqual(rsa.encrypt_bytes(b"", *key['P']), b"")
+        with self.assertRaises(ValueError):
+            rsa.decrypt_bytes(cipher[1:], *key['S'])
+
+        source, target = io.BytesIO(data), io.BytesIO()
+        target.writelines(rsa.encrypt_stream(source, *key['P'], chunk_blocks=3))
+        target.seek(0)
+        self.assertEqual(b"".join(rsa.decrypt_stream(target, *key['S'], chunk_blocks=2)), data)
+
+        # a raw file may return fewer bytes than asked.
+        class ShortReads(io.RawIOBase):
+            def __init__(self, data):
+                self.source = io.BytesIO(data)
+
+            def readinto(self, buffer):
+                chunk = self.source.read(min(len(buffer), 7))
+                buffer[:len(chunk)] = chunk
+                return len(chunk)
+
+        short = ShortReads(cipher)
+        self.assertEqual(b"".join(rsa.decrypt_stream(short, *key['S'])), data)
 
     def test_all(self):
         result = []
@@ -27,7 +112,7 @@ class Testrsa(unittest.TestCase):
         mssg = "Hello world!"
         mssg = rsa.text_to_ascii(mssg)
         mssg = rsa.encryption(mssg, key['P'][0], key['P'][1])
-        mssg = rsa.decryption(mssg, key['S'][0], key['S'][1])
+        mssg = rsa.decryption(mssg, *key['S'])
         for _ in mssg:
             result.append(chr(_))
         result = "".join(result)
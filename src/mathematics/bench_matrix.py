@@ -0,0 +1,145 @@
+"""
+
+Benchmarks of matrix.py.
+
+usage:
+    python bench_matrix.py                      # run and print the results
+    python bench_matrix.py -o results.json      # also write the results
+    python bench_matrix.py --save               # record the results as the baseline
+    python bench_matrix.py --threshold 0.2      # fail if a case is 20% slower than the baseline
+
+The result of a case is the best time of one call in seconds, over several repeats.
+The baseline depends on the machine, so record it on the machine running the comparison.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+from matrix import Matrix
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_matrix.json")
+SIZES = (16, 64, 128)
+
+
+def _cases(n, directory):
+    """
+
+    Generate (name, setup, statement) of the cases of n*n matrices.
+    The setup returns the object given to the statement.
+    """
+    def square():
+        return Matrix.rand(n, n, 'd', seed=n)
+
+    def rows():
+        return square().array
+
+    def files():
+        m = square()
+        txt = os.path.join(directory, "m{0}.txt".format(n))
+        binary = os.path.join(directory, "m{0}.bin".format(n))
+        m.to_file(txt, 'T')
+        m.bdump(binary)
+        return m, txt, binary
+
+    yield "construct", rows, lambda array: Matrix(array)
+    yield "construct_d", rows, lambda array: Matrix(array, 'd')
+    yield "mul", square, lambda m: m*m
+    yield "inv", square, lambda m: Matrix.inv(m)
+    yield "det", square, lambda m: Matrix.det(m)
+    yield "transpose", square, lambda m: m.T.array
+    yield "sum", square, lambda m: m.sum()
+    yield "sum_axis", square, lambda m: m.sum(0)
+    yield "var", square, lambda m: m.var(1)
+    yield "max", square, lambda m: m.max()
+    yield "sort", square, lambda m: m.copy().sort()
+    yield "reshape", square, lambda m: m.T.reshape((1, n*n))
+    yield "to_file_txt", files, lambda f: f[0].to_file(f[1], 'T')
+    yield "from_file_txt", files, lambda f: Matrix.from_file(f[1])
+    yield "bdump", files, lambda f: f[0].bdump(f[2])
+    yield "bload", files, lambda f: Matrix.bload(f[2])
+
+
+def run(sizes=SIZES, repeat=5, cases=None):
+    """
+
+    :type sizes: iterable
+    :rtype: dict
+
+    Run the cases whose name is in cases, all of them if cases is None.
+    The results are keyed by "name/size".
+    """
+    results = {}
+    directory = tempfile.mkdtemp()
+    try:
+        for n in sizes:
+            for name, setup, statement in _cases(n, directory):
+                if cases is not None and name not in cases:
+                    continue
+                arg = setup()
+                timer = timeit.Timer(lambda: statement(arg))
+                number, _ = timer.autorange()
+                best = min(timer.repeat(repeat, number))
+                results["{0}/{1}".format(name, n)] = best/number
+    finally:
+        shutil.rmtree(directory)
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+
+    :type results: dict
+    :type baseline: dict
+    :type threshold: float
+    :rtype: list
+
+    Get (case, baseline time, time, ratio) of the cases slower than the baseline
+    by more than threshold, e.g. 0.1 for 10%.
+    """
+    regressions = []
+    for case, seconds in sorted(results.items()):
+        if case in baseline and seconds > baseline[case]*(1 + threshold):
+            regressions.append((case, baseline[case], seconds, seconds/baseline[case]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark matrix.py.")
+    parser.add_argument("-s", "--sizes", type=int, nargs='+', default=SIZES)
+    parser.add_argument("-c", "--cases", nargs='+', help="names of the cases to run")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("-b", "--baseline", default=BASELINE)
+    parser.add_argument("-t", "--threshold", type=float, default=0.1,
+                        help="allowed slowdown against the baseline, 0.1 for 10%%")
+    parser.add_argument("--save", action="store_true", help="write the results to the baseline")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.cases)
+    for case, seconds in sorted(results.items()):
+        print("{0:<24}{1:.6e}".format(case, seconds))
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    if args.save:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, args.threshold)
+    for case, before, after, ratio in regressions:
+        print("regression {0}: {1:.6e} -> {2:.6e} ({3:.2f}x)".format(case, before, after, ratio))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
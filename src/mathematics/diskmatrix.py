@@ -0,0 +1,343 @@
+import os
+import sys
+import tempfile
+import weakref
+from array import array as _array
+from itertools import chain as _chain
+
+from matrix import Matrix, _HEADER, _MAGIC, _moments, _moments_by_line, _plain, _statistics
+
+
+__all__ = ["DiskMatrix"]
+
+# the kernels of Matrix work on lists of Python numbers, a pointer and a float for each element.
+_BOXED = 8 + sys.getsizeof(0.0)
+
+
+def _block_rows(memory, cols, parts=1):
+    """
+
+    Get the number of rows of cols elements in a block when parts blocks are held in memory bytes.
+    """
+    return max(1, memory // (parts*max(cols, 1)*_BOXED))
+
+
+def _remove(filename):
+    try:
+        os.remove(filename)
+    except FileNotFoundError:
+        pass
+
+
+class DiskMatrix(object):
+    """
+
+    :type filename: str
+    :type memory: int
+
+    A matrix kept in a binary matrix file, the format of Matrix.bdump, and processed by
+    blocks of rows so that the blocks held by an operation take at most memory bytes.
+    The blocks are Matrix objects, so the selected backend of Matrix does the arithmetic.
+    bytes_read and bytes_written count the I/O on the file of the matrix.
+    The temporary files, used when no filename is given, are removed with their matrices.
+
+    >>> m = Matrix([[1, 2], [3, 4], [5, 6]], typecode='d')
+    >>> disk = DiskMatrix.from_matrix(m, memory=16)
+    >>> (disk + disk).to_matrix()
+    [[2.0 4.0]
+     [6.0 8.0]
+     [10.0 12.0]]
+    >>> (disk * disk.transpose()).to_matrix()
+    [[5.0 11.0 17.0]
+     [11.0 25.0 39.0]
+     [17.0 39.0 61.0]]
+    >>> disk.sum(1)
+    [[9.0 12.0]]
+    >>> disk.var(0)
+    [[0.25]
+     [0.25]
+     [0.25]]
+    >>> disk.bytes_read > 0
+    True
+    """
+
+    def __init__(self, filename, memory=64 << 20):
+        self.filename = filename
+        self.memory = memory
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self._finalizer = None
+        with open(filename, 'rb') as file:
+            self.typecode, self.shape = Matrix._read_header(file)
+        self.itemsize = _array(self.typecode).itemsize
+
+    def __repr__(self):
+        return "DiskMatrix({0!r}, shape={1}, typecode={2!r})".format(self.filename, self.shape, self.typecode)
+
+    @classmethod
+    def create(cls, shape, typecode='d', filename=None, memory=64 << 20):
+        """
+
+        :type shape: tuple, list
+        :type typecode: str
+
+        Create a matrix filled with 0. A temporary file is used if filename is None.
+        """
+        temporary = filename is None
+        if temporary:
+            fd, filename = tempfile.mkstemp(suffix=".bin")
+            os.close(fd)
+        itemsize = _array(typecode).itemsize
+        with open(filename, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, 1, typecode.encode(), shape[0], shape[1]))
+            file.truncate(_HEADER.size + shape[0]*shape[1]*itemsize)
+        disk = cls(filename, memory)
+        return disk._temporary() if temporary else disk
+
+    @classmethod
+    def from_matrix(cls, mat, filename=None, memory=64 << 20):
+        """
+
+        :type mat: Matrix
+        """
+        disk = cls.create(mat.shape, _plain(mat.typecode) or 'd', filename, memory)
+        disk.write_rows(0, mat)
+        return disk
+
+    @classmethod
+    def from_text(cls, source, filename=None, sep=';', typecode='d', memory=64 << 20):
+        """
+
+        :type source: str
+
+        Convert the text matrix file source without loading it, see Matrix.iter_blocks.
+        The blocks are sized from the width of the first row to stay within memory.
+        """
+        lines = Matrix.iter_rows(source, sep)
+        first = next(lines, [])
+        lines.close()
+        block_rows = _block_rows(memory, len(first))
+        temporary = filename is None
+        if temporary:
+            fd, filename = tempfile.mkstemp(suffix=".bin")
+            os.close(fd)
+        rows = cols = 0
+        with open(filename, 'wb') as file:
+            # the shape is only known at the end.
+            file.write(_HEADER.pack(_MAGIC, 1, typecode.encode(), 0, 0))
+            for block in Matrix.iter_blocks(source, block_rows, sep, typecode):
+                if rows and block.shape[1] != cols:
+                    raise IndexError
+                rows, cols = rows + block.shape[0], block.shape[1]
+                data = _array(typecode, block._values())
+                if sys.byteorder == "big":
+                    data.byteswap()
+                data.tofile(file)
+            file.seek(0)
+            file.write(_HEADER.pack(_MAGIC, 1, typecode.encode(), rows, cols))
+        disk = cls(filename, memory)
+        disk.bytes_written = rows*cols*disk.itemsize
+        return disk._temporary() if temporary else disk
+
+    def _temporary(self):
+        """
+
+        Remove the file when the matrix is collected, or at exit.
+        """
+        self._finalizer = weakref.finalize(self, _remove, self.filename)
+        return self
+
+    def delete(self):
+        """
+
+        Remove the file of the matrix.
+        """
+        if self._finalizer is not None:
+            self._finalizer()
+        else:
+            os.remove(self.filename)
+
+    def _position(self, row):
+        return _HEADER.size + row*self.shape[1]*self.itemsize
+
+    def block_rows(self, parts=1):
+        """
+
+        Get the number of rows of a block when parts blocks of the same width are held together.
+        """
+        return _block_rows(self.memory, self.shape[1], parts)
+
+    def read_rows(self, start, stop):
+        """
+
+        :rtype: Matrix
+
+        Read the rows from start to stop.
+        """
+        count = (stop - start)*self.shape[1]
+        data = _array(self.typecode)
+        with open(self.filename, 'rb') as file:
+            file.seek(self._position(start))
+            data.fromfile(file, count)
+        if sys.byteorder == "big":
+            data.byteswap()
+        self.bytes_read += count*self.itemsize
+        return Matrix.__new__(Matrix)._wrap(data, (stop - start, self.shape[1]), self.typecode)
+
+    def write_rows(self, start, mat):
+        """
+
+        :type mat: Matrix
+
+        Write the rows of mat from the row start.
+        """
+        # the bytearray of a mask would be read as raw bytes, so its values are iterated.
+        data = _array(self.typecode, iter(mat._values()))
+        if sys.byteorder == "big":
+            data.byteswap()
+        with open(self.filename, 'r+b') as file:
+            file.seek(self._position(start))
+            data.tofile(file)
+        self.bytes_written += len(data)*self.itemsize
+
+    def blocks(self, rows=None):
+        """
+
+        Generate (start, block) of the blocks of rows.
+        """
+        rows = rows or self.block_rows()
+        for start in range(0, self.shape[0], rows):
+            yield start, self.read_rows(start, min(start + rows, self.shape[0]))
+
+    def to_matrix(self):
+        return self.read_rows(0, self.shape[0])
+
+    def add(self, other, filename=None):
+        """
+
+        :type other: DiskMatrix, Matrix, int, float
+
+        Add a matrix or a number, the result is written to filename.
+        """
+        if isinstance(other, (DiskMatrix, Matrix)) and other.shape != self.shape:
+            raise IndexError("two mats don't have the same shape.")
+        result = DiskMatrix.create(self.shape, self.typecode, filename, self.memory)
+        for start, block in self.blocks(self.block_rows(3)):
+            stop = start + block.shape[0]
+            if isinstance(other, DiskMatrix):
+                block = block + other.read_rows(start, stop)
+            elif isinstance(other, Matrix):
+                block = block + other[start: stop, :]
+            else:
+                block = block + other
+            result.write_rows(start, block)
+        return result
+
+    def matmul(self, other, filename=None):
+        """
+
+        :type other: DiskMatrix, Matrix
+
+        Multiply by a matrix block by block, the result is written to filename.
+        A block of rows of self is multiplied by the blocks of rows of other in turn, so
+        other is read once for each block of self.
+        """
+        if not isinstance(other, (DiskMatrix, Matrix)):
+            return self.scale(other, filename)
+        n, k = self.shape
+        m = other.shape[1]
+        if k != other.shape[0]:
+            raise IndexError
+
+        result = DiskMatrix.create((n, m), self.typecode, filename, self.memory)
+        rows = max(1, self.memory // ((k + 3*m)*_BOXED))
+        for start, block in self.blocks(rows):
+            product = None
+            for k0 in range(0, k, rows):
+                k1 = min(k0 + rows, k)
+                if isinstance(other, DiskMatrix):
+                    right = other.read_rows(k0, k1)
+                else:
+                    right = other[k0: k1, :]
+                part = block[:, k0: k1]*right
+                product = part if product is None else product + part
+            result.write_rows(start, product)
+        return result
+
+    def scale(self, n, filename=None):
+        """
+
+        Multiply by the number n, the result is written to filename.
+        """
+        result = DiskMatrix.create(self.shape, self.typecode, filename, self.memory)
+        for start, block in self.blocks(self.block_rows(2)):
+            result.write_rows(start, block*n)
+        return result
+
+    def transpose(self, filename=None):
+        """
+
+        :rtype: DiskMatrix
+
+        Write the transpose matrix to filename, a whole new file, so it is a method and not
+        a property. Each block of rows becomes a block of columns, written as a segment of
+        every row of the result.
+        """
+        rows, cols = self.shape
+        result = DiskMatrix.create((cols, rows), self.typecode, filename, self.memory)
+        with open(result.filename, 'r+b') as file:
+            for start, block in self.blocks(self.block_rows(2)):
+                for j, col in enumerate(block._cols()):
+                    data = _array(self.typecode, col)
+                    if sys.byteorder == "big":
+                        data.byteswap()
+                    file.seek(result._position(j) + start*self.itemsize)
+                    data.tofile(file)
+                    result.bytes_written += len(data)*self.itemsize
+        return result
+
+    def describe(self, axis=None):
+        """
+
+        :type axis: int
+
+        Get the statistics of Matrix.describe block by block. The rows of the blocks are
+        fed to a single pass of Welford's algorithm, one at a time, or reduced each on its
+        own for axis 0.
+        """
+        # a block is read while the previous one is still held.
+        blocks = self.blocks(self.block_rows(2))
+        rows = _chain.from_iterable(block._rows() for start, block in blocks)
+        if axis == 0:
+            return _statistics(_moments_by_line(rows, self.shape[1]), axis, Matrix._from_flat)
+        return _statistics(_moments(rows, self.shape[1]), axis, Matrix._from_flat)
+
+    def sum(self, axis=None):
+        return self.describe(axis)["sum"]
+
+    def mean(self, axis=None):
+        return self.describe(axis)["mean"]
+
+    def var(self, axis=None):
+        return self.describe(axis)["var"]
+
+    def std(self, axis=None):
+        return self.describe(axis)["std"]
+
+    def max(self, axis=None):
+        return self.describe(axis)["max"]
+
+    def min(self, axis=None):
+        return self.describe(axis)["min"]
+
+    def __add__(self, other):
+        return self.add(other)
+    __radd__ = __add__
+
+    def __mul__(self, other):
+        return self.matmul(other)
+
+    def __rmul__(self, other):
+        if isinstance(other, Matrix):
+            return DiskMatrix.from_matrix(other, memory=self.memory).matmul(self)
+        return self.scale(other)
@@ -1,14 +1,40 @@
+import heapq
+import os
 import random
-import time
+from array import array as _array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
-from copy import copy as _copy
+from itertools import chain as _chain, compress as _compress, islice as _islice, repeat as _repeat
+from operator import gt as _gt, ge as _ge, lt as _lt, le as _le
+from operator import add as _add, sub as _sub, mul as _mul, neg as _neg, truediv as _truediv, floordiv as _floordiv, mod as _mod
 from copy import deepcopy as _deepcopy
+from multiprocessing import shared_memory as _shared_memory
 try:
     from simplejson import dumps, load
 except ImportError:
     from json import dumps, load
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
 import math
+import mmap as _mmap
 import re
+import struct
+import sys
+import warnings
+import weakref
+
+
+# magic, version, typecode, rows and columns of the binary format, followed by the
+# elements in row-major order, little-endian.
+_HEADER = struct.Struct("<4sBc2xQQ")
+_MAGIC = b"MATX"
+# the typecode of the boolean masks given by the comparisons.
+_MASK = 'B'
+# the pivots of _select, apart from the global generator used by Matrix.rand and the like.
+_PIVOTS = random.Random()
 
 
 def _from_string(string):
@@ -28,19 +54,691 @@ def _from_string(string):
     return array
 
 
+def _read_rows(file, sep=';', chunk_size=1 << 20):
+    """
+
+    :type sep: str
+    :type chunk_size: int
+
+    Parse the rows of a text matrix from a file object chunk by chunk, only the rows in
+    the current chunk are kept in memory. Rows are separated by sep, the elements of a row
+    by whitespaces or commas.
+    """
+    rest = ''
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        parts = (rest + chunk).split(sep)
+        rest = parts.pop()
+        for part in parts:
+            row = [float(x) for x in part.replace(',', ' ').split()]
+            if row:
+                yield row
+    row = [float(x) for x in rest.replace(',', ' ').split()]
+    if row:
+        yield row
+
+
+def _buffer(values, typecode=None):
+    """
+
+    Pack the values into a flat buffer.
+    A list keeps the elements boxed, an array stores them unboxed with the given typecode.
+    The elements of a mask are bytes in a bytearray.
+    """
+    if typecode is None:
+        return list(values)
+    if typecode == _MASK:
+        return bytearray(values)
+    return _array(typecode, values)
+
+
+def _plain(typecode):
+    """
+
+    Get the typecode of a new matrix made from the elements of a matrix of typecode.
+    A mask only holds bytes, so it gives a list matrix.
+    """
+    return None if typecode == _MASK else typecode
+
+
+def _matmul(rows, cols, tile=64):
+    """
+
+    :type rows: list
+    :type cols: list
+    :type tile: int
+
+    Multiply the rows of the left matrix by the columns of the right one and return the
+    elements of the product in row-major order.
+    The columns are visited by blocks of tile columns, so a block is reused by every row
+    while it is still hot. Each element is accumulated by sum(map(mul, ...)) in one pass.
+    """
+    n, m = len(rows), len(cols)
+    if n == 1:
+        # vector-matrix product
+        row = rows[0]
+        return [sum(map(_mul, row, col)) for col in cols]
+    if m == 1:
+        # matrix-vector product
+        col = cols[0]
+        return [sum(map(_mul, row, col)) for row in rows]
+
+    result = [0]*(n*m)
+    for j0 in range(0, m, tile):
+        block = cols[j0: j0 + tile]
+        for i in range(n):
+            row = rows[i]
+            start = i*m + j0
+            result[start: start + len(block)] = [sum(map(_mul, row, col)) for col in block]
+    return result
+
+
+def _substitute(array, x, lower, unit=False, tolerance=0):
+    """
+
+    :type array: list
+    :type x: list
+    :type lower: bool
+    :type unit: bool
+    :type tolerance: float
+
+    Solve a triangular system in place of the rows of x, by forward substitution if lower
+    else backward substitution. The other triangle of array is ignored, and so is the main
+    diagonal if unit. A diagonal element not larger than tolerance times the largest element
+    of its row is taken as 0, as by _eliminate.
+    """
+    n = len(array)
+    for i in (range(n) if lower else range(n-1, -1, -1)):
+        row = array[i]
+        for k in (range(i) if lower else range(i+1, n)):
+            if row[k]:
+                x[i] = list(map(lambda y, z: y - row[k]*z, x[i], x[k]))
+        if not unit:
+            if abs(row[i]) <= tolerance*max(map(abs, row)):
+                raise ZeroDivisionError("singular matrix")
+            x[i] = [y/row[i] for y in x[i]]
+    return x
+
+
+def _householder(cols):
+    """
+
+    :type cols: list
+
+    QR factorization by Householder reflections of the columns cols of a matrix with at
+    least as many rows as columns. The columns are reduced in place to R, whose column j
+    is in the first j+1 elements of cols[j]. Get the reflectors (j, v, v*v) making Q.
+    """
+    reflectors = []
+    for j, col in enumerate(cols):
+        v = col[j:]
+        norm = math.hypot(*v)
+        if not norm:
+            continue
+        # the sign avoids the cancellation of v[0] - alpha.
+        v[0] += norm if v[0] >= 0 else -norm
+        reflector = (j, v, sum(map(_mul, v, v)))
+        for c in cols[j:]:
+            _reflect(reflector, c)
+        reflectors.append(reflector)
+    return reflectors
+
+
+def _reflect(reflector, col):
+    """
+
+    Apply a reflector of _householder to the column col in place.
+    """
+    j, v, vv = reflector
+    s = 2*sum(map(_mul, v, col[j:]))/vv
+    col[j:] = map(lambda x, y: x - s*y, col[j:], v)
+
+
+def _lstsq(a, b):
+    """
+
+    :type a: Matrix
+    :type b: Matrix
+
+    Get the rows of the least-squares solution of a*x = b if a has more rows than columns,
+    or of the solution of minimum norm if it has fewer, by a QR factorization of a or a.T.
+    """
+    m, n = a.shape
+    b_cols = [list(col) for col in b._cols()]
+    if m >= n:
+        cols = [list(col) for col in a._cols()]
+        reflectors = _householder(cols)
+        for col in b_cols:
+            for reflector in reflectors:
+                _reflect(reflector, col)
+        r = [[cols[k][i] for k in range(n)] for i in range(n)]
+        return _substitute(r, [list(row) for row in zip(*b_cols)][:n], False)
+
+    # a.T = Q*R, so a = R.T*Q.T and x = Q*(R.T**-1*b) extended by zeros.
+    cols = [list(row) for row in a._rows()]
+    reflectors = _householder(cols)
+    r_t = [[cols[i][k] for k in range(m)] for i in range(m)]
+    y = _substitute(r_t, [list(row) for row in zip(*b_cols)], True)
+    x_cols = []
+    for z in zip(*y):
+        z = list(z) + [0.0]*(n-m)
+        for reflector in reversed(reflectors):
+            _reflect(reflector, z)
+        x_cols.append(z)
+    return [list(row) for row in zip(*x_cols)]
+
+
+def _sized(lines, size):
+    """
+
+    Generate the lines, each one checked to have size elements.
+    """
+    for line in lines:
+        if len(line) != size:
+            raise IndexError("the lines don't have the same length")
+        yield line
+
+
+# the count of the numbers reduced for each position and, for each position, their sum,
+# mean, sum of squared deviations from the mean (M2), minimum and maximum.
+_Moments = namedtuple("_Moments", ["count", "sums", "means", "m2", "low", "high"])
+
+
+def _moments(lines, size):
+    """
+
+    :type lines: iterable
+    :type size: int
+
+    Run Welford's algorithm over lines of the same size in a single pass, for each
+    position of them at once, and get the _Moments of the positions.
+    """
+    n = 0
+    sums = [0]*size
+    means = [0.0]*size
+    m2 = [0.0]*size
+    low = high = None
+    for line in lines:
+        n += 1
+        sums = list(map(_add, sums, line))
+        delta = list(map(_sub, line, means))
+        means = [average + d/n for average, d in zip(means, delta)]
+        m2 = [a + d*(x - average) for a, d, x, average in zip(m2, delta, line, means)]
+        if low is None:
+            low, high = list(line), list(line)
+        else:
+            low = list(map(min, low, line))
+            high = list(map(max, high, line))
+    return _Moments(n, sums, means, m2, low, high)
+
+
+def _moments_by_line(lines, size):
+    """
+
+    :type lines: iterable
+    :type size: int
+
+    Reduce each of the lines of size numbers on its own by _line_moments, and get the
+    _Moments with a position for each line.
+    """
+    sums, means, m2, low, high = [], [], [], [], []
+    for line in lines:
+        n, average, deviations = _line_moments(line)
+        sums.append(sum(line))
+        means.append(average)
+        m2.append(deviations)
+        low.append(min(line))
+        high.append(max(line))
+    return _Moments(size, sums, means, m2, low, high)
+
+
+def _statistics(moments, axis, new):
+    """
+
+    :type moments: _Moments
+    :type new: function
+
+    Turn the _Moments of the positions into the statistics returned by Matrix.describe.
+    new(values, shape) generates the matrices of the results along an axis.
+    """
+    n, sums = moments.count, moments.sums
+    if axis is None:
+        total, average, m2 = _merge_moments(zip([n]*len(sums), moments.means, moments.m2))
+        var = m2/total
+        return {"count": total, "sum": sum(sums), "mean": sum(sums)/total, "var": var, "std": var**0.5,
+                "min": min(moments.low), "max": max(moments.high)}
+
+    shape = (len(sums), 1) if axis == 0 else (1, len(sums))
+    var = [x/n for x in moments.m2]
+    return {"count": n,
+            "sum": new(sums, shape),
+            "mean": new([x/n for x in sums], shape),
+            "var": new(var, shape),
+            "std": new([x**0.5 for x in var], shape),
+            "min": new(moments.low, shape),
+            "max": new(moments.high, shape)}
+
+
+def _line_moments(line):
+    """
+
+    :type line: list
+
+    Get the count, the mean and the M2 of the numbers of line, by two passes over it.
+    """
+    n = len(line)
+    if not n:
+        return 0, 0.0, 0.0
+    average = sum(line)/n
+    return n, average, sum([(x - average)**2 for x in line])
+
+
+def _merge_moments(parts):
+    """
+
+    :type parts: iterable
+
+    Merge (count, mean, M2) of parts of the data into the ones of the whole data,
+    see Chan et al. for the formula.
+    """
+    n, average, m2 = 0, 0.0, 0.0
+    for n_b, average_b, m2_b in parts:
+        if not n_b:
+            continue
+        delta = average_b - average
+        total = n + n_b
+        average += delta*n_b/total
+        m2 += m2_b + delta**2*n*n_b/total
+        n = total
+    return n, average, m2
+
+
+def _strided_slice(start, count, step):
+    """
+
+    Get the slice of count elements from start by step, step may be negative.
+    """
+    stop = start + count*step
+    if stop < 0:
+        stop = None
+    return slice(start, stop, step)
+
+
+def _strided(data, start, count, step):
+    return data[_strided_slice(start, count, step)]
+
+
+def _rng(seed=None):
+    """
+
+    :type seed: int, str, bytes, random.Random
+
+    Get the random number generator of seed, the global one of the random module if seed is None.
+    """
+    if seed is None:
+        return random
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+
+def _select(values, k):
+    """
+
+    :type values: list
+    :type k: int
+
+    Get the element of rank k (from 0) of values without sorting them, in average O(n).
+    """
+    # sorted runs in C and is faster on short lists.
+    while len(values) > 4096:
+        pivot = _PIVOTS.choice(values)
+        low = [x for x in values if x < pivot]
+        if k < len(low):
+            values = low
+            continue
+        high = [x for x in values if pivot < x]
+        equal = len(values) - len(low) - len(high)
+        if k < len(low) + equal:
+            return pivot
+        k -= len(low) + equal
+        values = high
+    return sorted(values)[k]
+
+
+def _partition(values, k):
+    """
+
+    Rearrange values so that the element of rank k is at k, the smaller elements before
+    it and the other ones after it.
+    """
+    pivot = _select(values, k)
+    return ([x for x in values if x < pivot] + [x for x in values if x == pivot] +
+            [x for x in values if pivot < x])
+
+
+def _median(values):
+    n = len(values)
+    if n <= 4096:
+        values = sorted(values)
+        return values[n // 2] if n % 2 else (values[n//2 - 1] + values[n // 2]) / 2
+    if n % 2:
+        return _select(values, n // 2)
+    return (_select(values, n//2 - 1) + _select(values, n // 2)) / 2
+
+
+def _pivot_tolerance(shape):
+    """
+
+    Get the relative tolerance of the pivots of a matrix of shape, see _eliminate.
+    """
+    return max(shape)*sys.float_info.epsilon
+
+
+def _eliminate(array, tolerance):
+    """
+
+    :type array: list
+    :type tolerance: float
+
+    Gaussian elimination with partial pivoting of the rows of array, in place.
+    An element not larger than tolerance times the magnitude of its row is taken as 0, so
+    a column without a larger element has no pivot and is skipped. The magnitude starts
+    as the largest element of the original row and grows with the multiples of the pivot
+    rows subtracted from it.
+    Scaling a row doesn't change which elements are taken as 0.
+    Get the array holding L and U, the permutation of the rows, its sign and the pivot columns.
+    """
+    rows = len(array)
+    cols = len(array[0]) if rows else 0
+    scales = [tolerance*max(map(abs, row), default=0) for row in array]
+    perm = list(range(rows))
+    sign = 1
+    pivots = []
+    r = 0
+    for j in range(cols):
+        if r == rows:
+            break
+        candidates = [x for x in range(r, rows) if abs(array[x][j]) > scales[x]]
+        if not candidates:
+            continue
+        p = max(candidates, key=lambda x: abs(array[x][j]))
+        if p != r:
+            array[p], array[r] = array[r], array[p]
+            scales[p], scales[r] = scales[r], scales[p]
+            perm[p], perm[r] = perm[r], perm[p]
+            sign = -sign
+
+        pivot_row = array[r]
+        for i in range(r+1, rows):
+            row = array[i]
+            k = row[j]/pivot_row[j]
+            row[j] = k
+            if k:
+                row[j+1:] = map(lambda x, y: x - k*y, row[j+1:], pivot_row[j+1:])
+                # the rounding errors of the pivot row are carried into row.
+                scales[i] += abs(k)*scales[r]
+        pivots.append(j)
+        r += 1
+    return array, perm, sign, pivots
+
+
+def _index_range(key, n):
+    """
+
+    :type key: int, slice
+    :type n: int
+
+    Turn an index or a slice of one axis into a range.
+    """
+    if isinstance(key, slice):
+        return range(*key.indices(n))
+    if key < 0:
+        key += n
+    if not 0 <= key < n:
+        raise IndexError("index out of range")
+    return range(key, key+1)
+
+
+class _Shares(object):
+    """
+
+    The matrices sharing a buffer, held by weak references so that dead ones leave.
+    Matrices aren't hashable, so they are keyed by id.
+    """
+
+    def __init__(self):
+        self._refs = {}
+
+    def _remove(self, ref):
+        key = ref.key
+        if self._refs.get(key) is ref:
+            del self._refs[key]
+
+    def add(self, mat):
+        ref = weakref.KeyedRef(mat, self._remove, id(mat))
+        self._refs[id(mat)] = ref
+
+    def discard(self, mat):
+        self._refs.pop(id(mat), None)
+
+    def __len__(self):
+        return len(self._refs)
+
+    def matrices(self):
+        return [mat for mat in (ref() for ref in list(self._refs.values())) if mat is not None]
+
+
 class Matrix(object):
+    """
+
+    The elements are kept in a flat buffer, row-major by default, and located with
+    an offset and a stride per axis. The buffer is a list unless a typecode of the
+    array module is given, e.g. Matrix(data, typecode='d') stores unboxed doubles.
+    transpose and reshape only change the offset, shape and strides. A matrix sharing
+    its buffer with another living one copies the buffer before it is written.
+    """
+    typecodes = (None, 'f', 'd')
+
+    def __init__(self, data=None, typecode=None):
+        if typecode not in Matrix.typecodes:
+            raise ValueError("typecode should be one of {0}".format(Matrix.typecodes))
 
-    def __init__(self, data=None):
         if data is None:
-            self.array = [[]]
+            array = [[]]
+        elif isinstance(data, str):
+            array = _from_string(data)
+        else:
+            array = [[element for element in row] for row in data]
+            if len(set([len(row) for row in array])) != 1:
+                raise IndexError
+        self._set_array(array, typecode)
+
+    def _set_array(self, array, typecode=None):
+        if len(array) == 1 and not len(array[0]):
+            shape = (0, 0)
         else:
-            try:
-                self.array = Matrix.from_string(data).array
-            except AttributeError:
-                self.array = [[element for element in row] for row in data]
-                if len(set([len(row) for row in self.array])) != 1:
-                    raise IndexError
-        self.shape = self._get_shape()
+            shape = (len(array), len(array[0]))
+        self._wrap(_buffer(_chain.from_iterable(array), typecode), shape, typecode)
+
+    def _wrap(self, data, shape, typecode=None, offset=0, strides=None, cow=False, shares=None):
+        """
+
+        Set the buffer and its layout. cow marks a buffer which is never written, e.g. a mapped
+        file, and shares is the _Shares of the matrices sharing the buffer, if any.
+        """
+        old = getattr(self, "_shares", None)
+        if old is not None:
+            old.discard(self)
+        if shares is not None:
+            shares.add(self)
+        self._shares = shares
+        self._data = data
+        self.typecode = typecode
+        self.shape = tuple(shape)
+        self._offset = offset
+        self._strides = (shape[1], 1) if strides is None else tuple(strides)
+        self._cow = cow
+        self._lu = None
+        return self
+
+    @classmethod
+    def _from_flat(cls, values, shape, typecode=None):
+        """
+
+        Generate a matrix from the elements in row-major order.
+        """
+        return cls.__new__(cls)._wrap(_buffer(values, typecode), shape, typecode)
+
+    def _new(self, values, shape=None):
+        """
+
+        Generate a matrix with the same storage as self, a list for a mask.
+        """
+        return Matrix._from_flat(values, shape or self.shape, _plain(self.typecode))
+
+    def _view(self, offset, shape, strides):
+        """
+
+        Generate a matrix sharing the buffer of self.
+        """
+        return Matrix.__new__(Matrix)._wrap(self._data, shape, self.typecode, offset, strides,
+                                            self._cow, self._share())
+
+    def _share(self):
+        """
+
+        Get the set of the matrices sharing the buffer of self, made on the first share.
+        Dead matrices leave the set, so a buffer is copied only while it is really shared.
+        """
+        if self._shares is None:
+            self._shares = _Shares()
+            self._shares.add(self)
+        return self._shares
+
+    @property
+    def _contiguous(self):
+        return self._strides == (self.shape[1], 1)
+
+    def _row(self, i):
+        return _strided(self._data, self._offset + i*self._strides[0], self.shape[1], self._strides[1])
+
+    def _col(self, j):
+        return _strided(self._data, self._offset + j*self._strides[1], self.shape[0], self._strides[0])
+
+    def _rows(self):
+        return (self._row(i) for i in range(self.shape[0]))
+
+    def _cols(self):
+        return (self._col(j) for j in range(self.shape[1]))
+
+    def _values(self):
+        """
+
+        Get the elements in row-major order.
+        """
+        if self._contiguous:
+            return self._data[self._offset: self._offset + self.shape[0]*self.shape[1]]
+        return _chain.from_iterable(self._rows())
+
+    def _detach(self):
+        """
+
+        Move the elements into a new contiguous buffer owned by self.
+        """
+        self._wrap(_buffer(self._values(), self.typecode), self.shape, self.typecode)
+
+    def _writable(self):
+        """
+
+        Make sure writing to the buffer won't affect other matrices.
+        If the other matrices sharing the buffer are smaller, e.g. slices of self, they get
+        their own copies and self keeps writing to the buffer.
+        A mask only holds bytes, it moves to a list on its first write.
+        """
+        self._lu = None
+        if self.typecode == _MASK:
+            self._wrap(list(self._values()), self.shape, None)
+        elif self._cow:
+            self._detach()
+        elif self._shares is not None and len(self._shares) > 1:
+            others = [mat for mat in self._shares.matrices() if mat is not self]
+            if sum(mat.shape[0]*mat.shape[1] for mat in others) < self.shape[0]*self.shape[1]:
+                for mat in others:
+                    mat._detach()
+            else:
+                self._detach()
+
+    def _store(self, values):
+        """
+
+        Write the elements, in row-major order, into the buffer of self.
+        The values are packed before the first write, so they may be read from self,
+        unless they already are a buffer of the storage of self.
+        """
+        self._writable()
+        if not (isinstance(values, _array) and values.typecode == self.typecode
+                or isinstance(values, list) and self.typecode is None):
+            values = _buffer(values, self.typecode)
+        rows, cols = self.shape
+        if len(values) != rows*cols:
+            raise IndexError("wrong number of elements")
+        if self._contiguous:
+            self._data[self._offset: self._offset + rows*cols] = values
+            return
+        s0, s1 = self._strides
+        for i in range(rows):
+            self._data[_strided_slice(self._offset + i*s0, cols, s1)] = values[i*cols: (i+1)*cols]
+
+    def _result(self, values, shape=None, out=None):
+        """
+
+        :type values: iterable, Matrix
+        :type out: Matrix
+
+        Generate the result of an operation from its elements or a matrix given by a backend.
+        If out is given, the result is written into it and out is returned.
+        """
+        if out is None:
+            return values if isinstance(values, Matrix) else self._new(values, shape)
+        if out.shape != (shape or self.shape):
+            raise IndexError("out doesn't have the shape of the result")
+        out._store(values._values() if isinstance(values, Matrix) else values)
+        return out
+
+    def _lists(self):
+        """
+
+        Get a copy of the elements as a list of lists.
+        """
+        if self.shape == (0, 0):
+            return [[]]
+        return [list(row) for row in self._rows()]
+
+    @property
+    def array(self):
+        """
+
+        The elements as a tuple of tuples, read-only since the rows aren't stored anywhere.
+        A matrix is changed by item assignment or by setting array.
+
+        >>> m = Matrix([[1, 2], [3, 4]])
+        >>> m.array
+        ((1, 2), (3, 4))
+        >>> m.array[0][0] = 9
+        Traceback (most recent call last):
+         ...
+        TypeError: 'tuple' object does not support item assignment
+        """
+        if self.shape == (0, 0):
+            return ((),)
+        return tuple(map(tuple, self._rows()))
+
+    @array.setter
+    def array(self, array):
+        self._set_array(array, self.typecode)
 
     def __getitem__(self, item):
         """
@@ -55,12 +753,39 @@ class Matrix(object):
          [3.0 4.0]]
         >>> m[2, 1]
         6.0
-        """
-        ret = self.get(item)
-        try:
-            return Matrix(ret)
-        except TypeError:
-            return ret
+        >>> m[1, :]
+        [[3.0 4.0]]
+        >>> m[::-2, ::-1]
+        [[6.0 5.0]
+         [2.0 1.0]]
+
+        A slice is a view sharing the elements with the matrix, which are copied
+        by the first one of them written.
+
+        >>> v = m[1:, :]
+        >>> v[0, 0] = 0.0
+        >>> v
+        [[0.0 4.0]
+         [5.0 6.0]]
+        >>> m[1, 0]
+        3.0
+
+        A mask selects the elements where it is true, as a row.
+
+        >>> m[m > 4.5]
+        [[5.0 6.0]]
+        """
+        if isinstance(item, Matrix):
+            values = list(self._masked(item))
+            return self._new(values, (1, len(values)))
+        i, j = item
+        if isinstance(i, slice) or isinstance(j, slice):
+            rows = _index_range(i, self.shape[0])
+            cols = _index_range(j, self.shape[1])
+            s0, s1 = self._strides
+            offset = self._offset + rows.start*s0 + cols.start*s1
+            return self._view(offset, (len(rows), len(cols)), (s0*rows.step, s1*cols.step))
+        return self.get(item)
 
     def __setitem__(self, key, value):
         """
@@ -86,37 +811,45 @@ class Matrix(object):
             [[8.1 2 3]
              [4.1 5 6]
              [7.7 8 9]]
-        """
-        try:
-            col_range = [key[1].start, key[1].stop]
-            if key[1].start is None:
-                col_range[0] = 0
-            if key[1].stop is None:
-                col_range[1] = self.shape[1]
-            array = self.array[key[0]]
-
-            for i, row in enumerate(array):
-                del row[key[1]]
-                for j in range(col_range[0], col_range[1]):
-                    row.insert(j, value[i][j])
-        except AttributeError:
-            self.array[key[0]][key[1]] = value
+            >>> m[m < 5] = 0
+            >>> m
+            [[8.1 0 0]
+             [0 5 6]
+             [7.7 8 9]]
+            >>> m[0: 2, 0: 2] = [[9]]
+            Traceback (most recent call last):
+             ...
+            IndexError: the value doesn't have the shape (2, 2)
+        """
+        if isinstance(key, Matrix):
+            if key.shape != self.shape:
+                raise IndexError("the mask doesn't have the shape of the matrix")
+            self._store([value if selected else element
+                         for element, selected in zip(self._values(), key._values())])
+            return
+        rows = _index_range(key[0], self.shape[0])
+        cols = _index_range(key[1], self.shape[1])
+        if not (isinstance(key[0], slice) or isinstance(key[1], slice)):
+            value = [[value]]
+        elif isinstance(value, Matrix):
+            value = value.array
+        if len(value) != len(rows) or any(len(row) != len(cols) for row in value):
+            raise IndexError("the value doesn't have the shape {0}".format((len(rows), len(cols))))
+
+        self._writable()
+        s0, s1 = self._strides
+        for x, row in zip(rows, value):
+            for y, element in zip(cols, row):
+                self._data[self._offset + x*s0 + y*s1] = element
 
     def __contains__(self, item):
-        for row in self.array:
-            if item in row:
-                return True
-        else:
-            return False
+        return item in iter(self)
 
     def __iter__(self):
-        self.__i = 0
-        self.__j = 0
-        return self
-
-    def __next__(self):
         """
 
+        Iterate over the elements in row-major order, each iteration is independent.
+
         >>> m0 = Matrix([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
         >>> for i in m0:
         ...     print(i)
@@ -130,17 +863,13 @@ class Matrix(object):
         7
         8
         9
+        >>> [(x, y) for x in Matrix([[1, 2]]) for y in Matrix([[3, 4]])]
+        [(1, 3), (1, 4), (2, 3), (2, 4)]
         """
-        if self.__i == self.shape[0]:
-            raise StopIteration
-
-        element = self.array[self.__i][self.__j]
-        self.__j += 1
-        if self.__j == self.shape[1]:
-            self.__j = 0
-            self.__i += 1
-
-        return element
+        if self._contiguous:
+            # unlike _values, nothing is copied before the first element.
+            return _islice(self._data, self._offset, self._offset + self.shape[0]*self.shape[1])
+        return _chain.from_iterable(self._rows())
 
     def __str__(self):
         string = []
@@ -168,14 +897,16 @@ class Matrix(object):
         return tmp[: len(tmp)-1]
 
     def __bool__(self):
-        if self.array != [[]]:
+        if self.shape != (0, 0):
             return True
         else:
             return False
 
     def __eq__(self, other):
-        for row1, row2 in zip(self.array, other.array):
-            if row1 != row2:
+        if self.shape != other.shape:
+            return False
+        for x, y in zip(self._values(), other._values()):
+            if x != y:
                 return False
         else:
             return True
@@ -186,151 +917,388 @@ class Matrix(object):
         else:
             return True
 
-    def __gt__(self, other):
-        result = []
-        if self.shape == other.shape:
-            for x, y in zip(self, other):
-                if x > y:
-                    result.append(1)
-                else:
-                    result.append(0)
+    def _compare(self, op, other):
+        """
+
+        Compare the elements with the elements of the matrix other or with the number other.
+        The result is a mask, a matrix of 0 and 1 stored in a bytearray.
+        """
+        if isinstance(other, Matrix):
+            if self.shape != other.shape:
+                raise IndexError
+            values = map(op, self._values(), other._values())
         else:
-            raise IndexError
-        return Matrix.from_list(result, self.shape)
+            values = map(op, self._values(), _repeat(other))
+        return Matrix._from_flat(values, self.shape, _MASK)
+
+    def _masked(self, mask):
+        if mask.shape != self.shape:
+            raise IndexError("the mask doesn't have the shape of the matrix")
+        return _compress(self._values(), mask._values())
+
+    def __gt__(self, other):
+        """
+
+        >>> m = Matrix([[1, 5], [3, 2]])
+        >>> m > Matrix([[2, 2], [2, 2]])
+        [[0 1]
+         [1 0]]
+        >>> m <= 2
+        [[1 0]
+         [0 1]]
+
+        The result is a mask of bytes, it becomes a list matrix when it is written to.
+
+        >>> mask = m > 2
+        >>> mask *= 0.5
+        >>> mask[0, 0] = 300
+        >>> mask
+        [[300 0.5]
+         [0.5 0.0]]
+        """
+        return self._compare(_gt, other)
 
     def __lt__(self, other):
-        _ = self >= other
-        return Matrix.from_list(map(lambda x: not x, _.flat()), self.shape)
+        return self._compare(_lt, other)
 
     def __ge__(self, other):
-        result = []
-        if self.shape == other.shape:
-            for x, y in zip(self, other):
-                if x >= y:
-                    result.append(1)
-                else:
-                    result.append(0)
-        else:
-            raise IndexError
-        return Matrix.from_list(result, self.shape)
+        return self._compare(_ge, other)
 
     def __le__(self, other):
-        _ = self > other
-        return Matrix.from_list(map(lambda x: not x, _.flat()), self.shape)
+        return self._compare(_le, other)
+
+    @staticmethod
+    def where(mask, mat1, mat2):
+        """
+
+        :type mask: Matrix
+        :type mat1: Matrix, int, float
+        :type mat2: Matrix, int, float
+
+        Generate a matrix taking the elements of mat1 where mask is true and
+        the elements of mat2 elsewhere. A number stands for a matrix filled with it.
+
+        >>> m = Matrix([[1, -2], [-3, 4]])
+        >>> Matrix.where(m > 0, m, 0)
+        [[1 0]
+         [0 4]]
+        """
+        values = []
+        for mat in (mat1, mat2):
+            if isinstance(mat, Matrix):
+                if mat.shape != mask.shape:
+                    raise IndexError("two mats don't have the same shape.")
+                values.append(mat._values())
+            else:
+                values.append(_repeat(mat))
+        typecode = _plain(next((mat.typecode for mat in (mat1, mat2) if isinstance(mat, Matrix)), None))
+        values = [x if selected else y for selected, x, y in zip(mask._values(), *values)]
+        return Matrix._from_flat(values, mask.shape, typecode)
 
     def __pos__(self):
         return self
 
     def __neg__(self):
-        return -1*self
+        result = Matrix.backend.elementwise(_neg, self)
+        if result is not NotImplemented:
+            return result
+        return self._new(map(_neg, self._values()))
 
     def __abs__(self):
-        array = [[abs(element) for element in row] for row in self.array]
-        return Matrix(array)
+        result = Matrix.backend.elementwise(abs, self)
+        if result is not NotImplemented:
+            return result
+        return self._new(map(abs, self._values()))
 
-    def __add__(self, other):
+    def _elementwise(self, op, other, out=None):
+        """
+
+        Apply the binary op to the elements of self and other, a matrix or a number.
+        """
+        if not isinstance(other, Matrix) and hasattr(other, "shape"):
+            # other matrix types, e.g. SparseMatrix, handle the operation themselves.
+            return NotImplemented
+        result = Matrix.backend.elementwise(op, self, other)
+        if result is not NotImplemented:
+            return self._result(result, out=out)
+        if not isinstance(other, Matrix):
+            return self._result(map(op, self._values(), _repeat(other)), out=out)
         if self.shape != other.shape:
             raise IndexError("two mats don't have the same shape.")
-        try:
-            result = []
-            tmp = []
-            for row1, row2 in zip(self.array, other.array):
-                for element1, element2 in zip(row1, row2):
-                    tmp.append(element1 + element2)
-                result.append(tmp)
-                tmp = []
-            return Matrix(result)
-        except AttributeError:
-            return Matrix([[element + other for element in row] for row in self.array])
-    __iadd__ = __add__
+        return self._result(map(op, self._values(), other._values()), out=out)
+
+    def add(self, other, out=None):
+        """
+
+        :type other: Matrix, int, float
+        :type out: Matrix
+
+        The sum of self and other, written into out if it is given.
+
+        >>> m = Matrix([[1, 2], [3, 4]], typecode='d')
+        >>> out = Matrix.zero(2, 2, 'd')
+        >>> Matrix.add(m, m, out=out) is out
+        True
+        >>> out
+        [[2.0 4.0]
+         [6.0 8.0]]
+        """
+        return self._elementwise(_add, other, out)
+
+    def __add__(self, other):
+        """
+
+        >>> m = Matrix([[1, 2], [3, 4]], typecode='d')
+        >>> m + m.T
+        [[2.0 5.0]
+         [5.0 8.0]]
+        >>> m + 1
+        [[2.0 3.0]
+         [4.0 5.0]]
+        """
+        return self.add(other)
     __radd__ = __add__
 
-    def __mul__(self, other):
-        result = []
+    def __iadd__(self, other):
+        """
 
-        def num_mul(mat, n):
-            for i in range(mat.shape[0]):
-                result.append([n*x for x in mat.array[i]])
-            return result
+        Add other to the elements of self, without a new matrix.
 
-        def mat_mul(mat1, mat2):
-            if mat1.shape[1] != mat2.shape[0]:
-                raise IndexError
+        >>> m = Matrix([[1, 2], [3, 4]])
+        >>> v = m
+        >>> m += m.T
+        >>> v is m
+        True
+        >>> m[:, 1:] += 1
+        >>> m
+        [[2 6]
+         [5 9]]
+        """
+        return self.add(other, out=self)
 
-            def _mul(arr1, arr2):
-                return sum([x*y for x, y in zip(arr1, arr2)])
+    def mul(self, other, out=None):
+        """
 
-            tmp = []
-            mat2 = mat2.transpose
-            for i in range(mat1.shape[0]):
-                for j in range(mat2.shape[0]):
-                    tmp.append(_mul(mat1.array[i], mat2.array[j]))
-                result.append(tmp)
-                tmp = []
-            return result
+        :type other: Matrix, int, float
+        :type out: Matrix
 
-        try:
-            return Matrix(mat_mul(self, other))
-        except AttributeError:
-            return Matrix(num_mul(self, other))
-    __imul__ = __mul__
+        The product of two matrices or the product by a number, written into out if it is given.
+        The elementwise product is pw_product.
+
+        >>> m = Matrix([[1, 2], [3, 4]])
+        >>> out = Matrix.zero(2, 2)
+        >>> m.mul(m.T, out=out) is out
+        True
+        >>> out
+        [[5 11]
+         [11 25]]
+        """
+        if not isinstance(other, Matrix) and hasattr(other, "shape"):
+            # other matrix types, e.g. SparseMatrix, handle the operation themselves.
+            return NotImplemented
+        if not isinstance(other, Matrix):
+            result = Matrix.backend.elementwise(_mul, self, other)
+            if result is not NotImplemented:
+                return self._result(result, out=out)
+            return self._result([other*x for x in self._values()], out=out)
+        if self.shape[1] != other.shape[0]:
+            raise IndexError
+
+        shape = (self.shape[0], other.shape[1])
+        result = Matrix.backend.matmul(self, other)
+        if result is not NotImplemented:
+            return self._result(result, shape, out)
+
+        # lists iterate faster than arrays when they are reused many times.
+        rows = [list(row) for row in self._rows()]
+        cols = [list(col) for col in other._cols()]
+        values = _matmul(rows, cols, Matrix.tile_size)
+        return self._result(values, shape, out)
+
+    def __mul__(self, other):
+        """
+
+        >>> m = Matrix([[1, 2, 3], [4, 5, 6]])
+        >>> m * m.T
+        [[14 32]
+         [32 77]]
+        >>> 2 * m
+        [[2 4 6]
+         [8 10 12]]
+        >>> Matrix([[1, 2, 3]]) * m.T
+        [[14 32]]
+        >>> m * Matrix([[1], [0], [1]])
+        [[4]
+         [10]]
+        """
+        return self.mul(other)
     __rmul__ = __mul__
 
+    def __imul__(self, other):
+        """
+
+        Multiply self by a number or by a matrix keeping its shape, without a new matrix.
+        A product of another shape is a new matrix.
+
+        >>> m = Matrix([[1, 2], [3, 4]])
+        >>> m *= 2
+        >>> m *= Matrix([[0, 1], [1, 0]])
+        >>> m
+        [[4 2]
+         [8 6]]
+        >>> m *= Matrix([[1], [1]])
+        >>> m
+        [[6]
+         [14]]
+        """
+        if isinstance(other, Matrix) and (self.shape[0], other.shape[1]) != self.shape:
+            return self.mul(other)
+        return self.mul(other, out=self)
+
+    def sub(self, other, out=None):
+        """
+
+        :type other: Matrix, int, float
+        :type out: Matrix
+
+        The difference of self and other, written into out if it is given.
+        """
+        return self._elementwise(_sub, other, out)
+
     def __sub__(self, other):
-        return self + (-other)
-    __isub__ = __sub__
-    __rsub__ = __sub__
+        """
+
+        >>> m = Matrix([[1, 2], [3, 4]])
+        >>> m - m.T
+        [[0 -1]
+         [1 0]]
+        >>> 1 - m
+        [[0 -1]
+         [-2 -3]]
+        """
+        return self.sub(other)
+
+    def __isub__(self, other):
+        return self.sub(other, out=self)
+
+    def __rsub__(self, other):
+        return self._new([other - element for element in self._values()])
+
+    def truediv(self, other, out=None):
+        """
+
+        :type other: Matrix, int, float
+        :type out: Matrix
+
+        The elementwise quotient of self and other, written into out if it is given.
+
+        >>> m = Matrix([[1, 2], [3, 4]], typecode='d')
+        >>> m /= 2
+        >>> m
+        [[0.5 1.0]
+         [1.5 2.0]]
+        """
+        return self._elementwise(_truediv, other, out)
 
     def __truediv__(self, other):
+        return self.truediv(other)
+
+    def __itruediv__(self, other):
+        return self.truediv(other, out=self)
+
+    def floordiv(self, other, out=None):
         """
 
-        :type other: int, float
+        :type other: Matrix, int, float
+        :type out: Matrix
         """
-        try:
-            return (1/other)*self
-        except AttributeError:
-            AttributeError("num type expected not {0}".format(type(other)))
-    __itruediv__ = __truediv__
+        return self._elementwise(_floordiv, other, out)
 
     def __floordiv__(self, other):
+        return self.floordiv(other)
+
+    def __ifloordiv__(self, other):
+        return self.floordiv(other, out=self)
+
+    def mod(self, other, out=None):
         """
 
-        :type other: int, float
+        :type other: Matrix, int, float
+        :type out: Matrix
         """
-        return Matrix([[element//other for element in row] for row in self.array])
-    __ifloordiv__ = __floordiv__
+        return self._elementwise(_mod, other, out)
 
     def __mod__(self, other):
-        """
+        return self.mod(other)
 
-        :type other: int, float
-        """
-        return Matrix([[element % other for element in row] for row in self.array])
-    __imod__ = __mod__
+    def __imod__(self, other):
+        return self.mod(other, out=self)
 
     def __floor__(self):
-        return Matrix([[math.floor(element) for element in row] for row in self.array])
+        result = Matrix.backend.elementwise(math.floor, self)
+        if result is not NotImplemented:
+            return result
+        return self._new(map(math.floor, self._values()))
 
     def __ceil__(self):
-        return Matrix([[math.ceil(element) for element in row] for row in self.array])
+        result = Matrix.backend.elementwise(math.ceil, self)
+        if result is not NotImplemented:
+            return result
+        return self._new(map(math.ceil, self._values()))
 
     def __pow__(self, power):
+        """
+
+        :type power: int
+
+        Raise the matrix to the power by repeated squaring, which takes O(log(power))
+        products. A negative power raises the inverse matrix.
+
+        >>> m = Matrix([[1, 1], [1, 0]])
+        >>> m**10
+        [[89 55]
+         [55 34]]
+        >>> m**0
+        [[1 0]
+         [0 1]]
+        >>> m**-2
+        [[1.0 -1.0]
+         [-1.0 2.0]]
+        """
         if self.shape[0] != self.shape[1]:
             raise IndexError("square matrix expected")
-
-        m = Matrix.eye(self.shape[0])
-        try:
-            for i in range(power):
-                m *= self
-            return m
-        except TypeError:
+        if not isinstance(power, int):
             raise TypeError("<class 'int'> expected got {0}".format(type(power)))
-    __ipow__ = __pow__
+
+        base = self
+        if power < 0:
+            base = Matrix.inv(self)
+            if base is None:
+                raise ZeroDivisionError("singular matrix can't be raised to a negative power")
+            power = -power
+        if power == 0:
+            return Matrix.eye(self.shape[0], self.typecode)
+
+        result = None
+        while True:
+            if power & 1:
+                result = base.copy() if result is None else result*base
+            power >>= 1
+            if not power:
+                return result
+            base = base*base
+
+    def __ipow__(self, power):
+        return self._result(self**power, out=self)
 
     def __copy__(self):
         cls = self.__class__
         new_mat = cls()
         new_mat.__dict__.update(self.__dict__)
+        # the buffer is shared until one of them is written.
+        new_mat._shares = None
+        new_mat._wrap(self._data, self.shape, self.typecode, self._offset, self._strides,
+                      self._cow, self._share())
         return new_mat
 
     def __deepcopy__(self, memodict=None):
@@ -341,9 +1309,25 @@ class Matrix(object):
         new_mat = cls()
         memodict[id(self)] = new_mat
         for key, item in self.__dict__.items():
+            if key == "_shares":
+                continue
+            if isinstance(item, memoryview):
+                # a mapped file is copied into memory.
+                item = _array(self.typecode, item)
             setattr(new_mat, key, _deepcopy(item, memodict))
+        new_mat._cow = False
+        new_mat._shares = None
         return new_mat
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_shares"] = None
+        if isinstance(self._data, memoryview):
+            # a mapped file is pickled as an array in memory, like __deepcopy__.
+            state["_data"] = _array(self.typecode, self._data)
+            state["_cow"] = False
+        return state
+
     def copy(self):
         return self.__copy__()
 
@@ -351,10 +1335,11 @@ class Matrix(object):
         return self.__deepcopy__()
 
     @staticmethod
-    def pw_product(mat1, mat2):
+    def pw_product(mat1, mat2, out=None):
         """
         :type mat1: Matrix
         :type mat2: Matrix
+        :type out: Matrix
 
         usage:
         >>> m0 = Matrix([[1, 2, 3.1], [4, 5, 6], [7, 8, 9]])
@@ -371,15 +1356,19 @@ class Matrix(object):
         [[1.5 4.6 9.3]
          [16.4 25 36]
          [53.9 64 81]]
+
+        An Expression operand gives an Expression, evaluated into out if it is given.
         """
+        if isinstance(mat2, Expression):
+            result = Expression(_mul, mat1, mat2)
+            return result if out is None else mat1._result(result.evaluate(), out=out)
         if mat1.shape != mat2.shape:
             raise IndexError("two mats don't have the same shape")
+        result = Matrix.backend.elementwise(_mul, mat1, mat2)
+        if result is not NotImplemented:
+            return mat1._result(result, out=out)
 
-        result = []
-        for row1, row2 in zip(mat1.array, mat2.array):
-            tmp = [element1*element2 for element1, element2 in zip(row1, row2)]
-            result.append(tmp)
-        return Matrix(result)
+        return mat1._result(map(_mul, mat1._values(), mat2._values()), out=out)
 
     @property
     def transpose(self):
@@ -388,43 +1377,20 @@ class Matrix(object):
         :rtype: Matrix
 
         get transpose of the matrix
+        The result shares the elements with the matrix, only the shape and the strides are swapped.
+
+        >>> m = Matrix([[1, 2, 3], [4, 5, 6]])
+        >>> t = m.T
+        >>> t
+        [[1 4]
+         [2 5]
+         [3 6]]
+        >>> t[0, 1] = 0
+        >>> m
+        [[1 2 3]
+         [4 5 6]]
         """
-        if not self.array:
-            return None
-        t_array = [[row[j] for row in self.array] for j in range(self.shape[1])]
-        return Matrix(t_array)
-
-    @staticmethod
-    def _transform(array, row, identity=False):
-        """
-
-        :rtype: list, int
-
-        Transfer the matrix to a lower triangular matrix or a diagonal matrix according to the
-        arg identity.
-        """
-        count = 0
-        for j in range(row):
-            for i in range(j+1, row):
-                if not array[j][j]:
-                    _ = [x for x in range(i, row) if array[x][j]]
-                    if _:
-                        _ = _.pop(0)
-                    else:
-                        return array, count
-                    array[j], array[_] = array[_], array[j]
-                    count += 1
-                k = array[i][j]/array[j][j]
-                array[i] = list(map(lambda x, y: y - k*x, array[j], array[i]))
-
-        if identity:
-            for j in range(row-1, -1, -1):
-                for i in range(j-1, -1, -1):
-                    if not array[j][j]:
-                        array[j], array[i] = array[i], array[j]
-                    k = array[i][j]/array[j][j]
-                    array[i] = list(map(lambda x, y: y - k*x, array[j], array[i]))
-        return array, count
+        return self._view(self._offset, self.shape[::-1], self._strides[::-1])
 
     @staticmethod
     def inv(mat):
@@ -434,24 +1400,62 @@ class Matrix(object):
         """
         if mat.shape[0] != mat.shape[1]:
             raise IndexError("square matrix expected")
-        if Matrix.det(mat) == 0:
-            return None
+        result = Matrix.backend.inv(mat)
+        if result is not NotImplemented:
+            return result
         if not mat:
             return mat
+        return mat.lu().inv()
 
-        array = _deepcopy(mat.array)
-        e = Matrix.eye(mat.shape[0])
-        for i, row in enumerate(array):
-            row.extend(e.array[i])
+    @staticmethod
+    def solve(a, b, lstsq=False):
+        """
 
-        array = Matrix._transform(array, mat.shape[0], True)[0]
-        for i in range(mat.shape[0]):
-            if array[i][i] != 1:
-                array[i] = list(map(lambda x: x/array[i][i], array[i]))
+        :type a: Matrix
+        :type b: Matrix
+        :type lstsq: bool
 
-        for row in array:
-            del row[0: mat.shape[0]]
-        return Matrix(array)
+        Solve a*x = b without inverting a, a column of b for each right-hand side.
+        A triangular matrix is solved by substitution only, others through a.lu().
+        If lstsq, a non-square a gets the least-squares solution when it has more rows
+        than columns, and the solution of minimum norm when it has fewer, by a Householder
+        QR factorization which doesn't square the condition number like the normal equations.
+
+        >>> a = Matrix([[2, 1], [1, 3]])
+        >>> Matrix.solve(a, Matrix([[3], [5]]))
+        [[0.8]
+         [1.4]]
+        >>> Matrix.solve(Matrix([[2, 0], [1, 4]]), Matrix([[2, 4], [9, 6]]))
+        [[1.0 2.0]
+         [2.0 1.0]]
+        >>> x = Matrix.solve(Matrix([[1, 0], [1, 1], [1, 2]]), Matrix([[1], [2], [3]]), lstsq=True)
+        >>> [round(v, 12) for v in x]
+        [1.0, 1.0]
+        >>> x = Matrix.solve(Matrix([[1, 1]]), Matrix([[2]]), lstsq=True)
+        >>> [round(v, 12) for v in x]
+        [1.0, 1.0]
+        """
+        if a.shape[0] != b.shape[0]:
+            raise IndexError("b should have {0} rows".format(a.shape[0]))
+        if a.shape[0] != a.shape[1]:
+            if not lstsq:
+                raise IndexError("square matrix expected")
+            result = Matrix.backend.lstsq(a, b)
+            if result is not NotImplemented:
+                return result
+            return Matrix(_lstsq(a, b), _plain(b.typecode))
+
+        result = Matrix.backend.solve(a, b)
+        if result is not NotImplemented:
+            return result
+
+        array = a._lists()
+        upper = not any(any(row[:i]) for i, row in enumerate(array))
+        lower = not any(any(row[i+1:]) for i, row in enumerate(array))
+        if upper or lower:
+            x = _substitute(array, [list(row) for row in b._rows()], lower, tolerance=_pivot_tolerance(a.shape))
+            return Matrix(x, _plain(b.typecode))
+        return a.lu().solve(b)
 
     @property
     def __solve_i(self):
@@ -463,24 +1467,20 @@ class Matrix(object):
 
         Solve the determinant of the square matrix.
         """
-        array = _copy(mat.array)
-        # avoid changing the elements in the matrix.
-        # The reason of using copy instead of deepcopy is due to the function _transform.
-
         if mat.shape[0] != mat.shape[1]:
             raise IndexError
         if mat.shape[0] == mat.shape[1] == 0:
             return 1
-
-        array, count = Matrix._transform(array, mat.shape[0])
-        main_diagonal = [array[i][i] for i in range(mat.shape[0])]
-        return reduce(lambda x, y: x*y, main_diagonal)*(-1)**count
+        result = Matrix.backend.det(mat)
+        if result is not NotImplemented:
+            return result
+        return mat.lu().det
 
     @property
     def trace(self):
         if self.shape[0] != self.shape[1]:
             raise IndexError("square matrix expected")
-        return sum([row[i] for i, row in enumerate(self.array)])
+        return sum([self.get((i, i)) for i in range(self.shape[0])])
 
     @property
     def rank(self):
@@ -492,19 +1492,45 @@ class Matrix(object):
 
         if self.shape[0] != self.shape[1]:
             raise IndexError("square matrix expected")
+        result = Matrix.backend.rank(self)
+        if result is not NotImplemented:
+            return result
+        return self.lu().rank
 
-        array = Matrix._transform(self.array, self.shape[0])[0]
-        count = 0
-        for row in array:
-            if len(set(row)) > 1:
-                count += 1
-        return count
-
-    def _get_shape(self):
-        if self:
-            return len(self.array), len(self.array[0])
-        else:
-            return 0, 0
+    def lazy(self):
+        """
+
+        :rtype: Expression
+
+        Start a lazy expression of the matrix. The elementwise operations on it are
+        recorded and run in a single pass by evaluate().
+
+        >>> a = Matrix([[1, 2], [3, 4]])
+        >>> b = Matrix([[4, 3], [2, 1]])
+        >>> ((a.lazy() + b)*2 - a).evaluate()
+        [[9 8]
+         [7 6]]
+        """
+        return Expression(None, self)
+
+    def lu(self):
+        """
+
+        :rtype: LU
+
+        Get the LU factorization of the matrix. It is computed once and kept until
+        the matrix is changed.
+
+        >>> m = Matrix([[2, 1], [4, 3]])
+        >>> m.lu() is m.lu()
+        True
+        >>> m[0, 0] = 1
+        >>> m.lu().det
+        -1.0
+        """
+        if self._lu is None:
+            self._lu = LU(self)
+        return self._lu
 
     def reshape(self, shape):
         """
@@ -535,15 +1561,12 @@ class Matrix(object):
         if self.shape[0]*self.shape[1] != shape[0]*shape[1]:
             raise IndexError
 
-        new_array = []
-        tmp = []
-        for i, element in enumerate(self):
-            tmp.append(element)
-            if (i+1) % shape[1] == 0:
-                new_array.append(tmp)
-                tmp = []
-        self.array = new_array
-        self.shape = self._get_shape()
+        # only a transposed matrix needs moving its elements.
+        if not self._contiguous:
+            self._detach()
+        self.shape = tuple(shape)
+        self._strides = (shape[1], 1)
+        self._lu = None
         # return self if unittest needed
 
     def fill(self, value):
@@ -563,16 +1586,91 @@ class Matrix(object):
          [-1 -1 -1]
          [-1 -1 -1]]
         """
-        for ind, element in enumerate(self):
-            i, j = divmod(ind, self.shape[1])
-            self.array[i][j] = value
+        typecode = _plain(self.typecode)
+        self._wrap(_buffer([value]*(self.shape[0]*self.shape[1]), typecode), self.shape, typecode)
 
     def flat(self):
         """
 
-        Turn the matrix to a list and return a generator.
+        Get an iterator over the elements in row-major order.
+        """
+        return iter(self)
+
+    def map(self, func):
+        """
+
+        :type func: callable
+
+        Generate a matrix by applying func to each element.
+
+        >>> Matrix([[1, 2], [3, 4]]).map(lambda x: x*x + 1)
+        [[2 5]
+         [10 17]]
+        """
+        return self._new(map(func, self._values()))
+
+    def apply(self, func, axis=None):
+        """
+
+        :type func: callable
+        :type axis: int
+
+        Apply func to each row if axis is 0, to each column if axis is 1, or to the list of
+        all the elements in row-major order if axis is None.
+        If func returns a number, the results are a column (axis 0), a row (axis 1) or the
+        number itself (axis None). Otherwise func returns the new elements of the row,
+        the column or the matrix.
+
+        >>> m = Matrix([[3, 1, 2], [6, 5, 4]])
+        >>> m.apply(sum, 0)
+        [[6]
+         [15]]
+        >>> m.apply(sorted, 0)
+        [[1 2 3]
+         [4 5 6]]
+        >>> m.apply(lambda col: col[::-1], 1)
+        [[6 5 4]
+         [3 1 2]]
+        >>> m.T.apply(lambda values: values[:2])
+        Traceback (most recent call last):
+        ...
+        IndexError: the result doesn't have the size of the matrix
+        >>> m.T.apply(len)
+        6
+        """
+        if axis is None:
+            # a view generates its elements, func gets them in a list as for any matrix.
+            result = func(list(self._values()))
+            if not hasattr(result, "__iter__"):
+                return result
+            result = list(result)
+            if len(result) != self.shape[0]*self.shape[1]:
+                raise IndexError("the result doesn't have the size of the matrix")
+            return self._new(result)
+
+        return self._apply_lines(func, axis, self._new)
+
+    def _apply_lines(self, func, axis, new):
+        """
+
+        Apply func to each row or column like apply, the result is made by new(values, shape).
         """
-        return (x for x in self)
+        if axis == 0:
+            lines = [func(row) for row in self._rows()]
+        elif axis == 1:
+            lines = [func(col) for col in self._cols()]
+        else:
+            raise ValueError("axis should be None, 0 or 1")
+        if not lines or not hasattr(lines[0], "__iter__"):
+            shape = (len(lines), 1) if axis == 0 else (1, len(lines))
+            return new(lines, shape)
+
+        lines = [list(line) for line in lines]
+        if len(set(map(len, lines))) != 1:
+            raise IndexError("the results don't have the same length")
+        if axis == 0:
+            return new(_chain.from_iterable(lines), (len(lines), len(lines[0])))
+        return new(_chain.from_iterable(zip(*lines)), (len(lines[0]), len(lines)))
 
     def repeat(self, repeats, axis):
         """
@@ -598,19 +1696,25 @@ class Matrix(object):
          [7 8]
          [7 8]
          [7 8]]
+        >>> (m > 4).repeat(2, 1)
+        [[0 0 0 0]
+         [0 1 0 1]
+         [1 1 1 1]]
         """
         if isinstance(repeats, int):
             repeats = [repeats]*self.shape[0]
 
+        # the rows are copied once, the array property builds them on each call.
+        rows = self.array
         new_arr = []
         if axis == 0:
-            array = [[row]*i for row, i in zip(self.array, (x for x in repeats))]
+            array = [[row]*i for row, i in zip(rows, (x for x in repeats))]
             for row in array:
                 new_arr.extend(row)
         else:
             for ind, i in enumerate(repeats):
-                new_arr.append(self.array[ind]*i)
-        mat = Matrix(new_arr)
+                new_arr.append(rows[ind]*i)
+        mat = Matrix(new_arr, _plain(self.typecode))
         del new_arr
 
         return mat
@@ -645,61 +1749,126 @@ class Matrix(object):
          [2 4 6]
          [7 8 9]]
         """
-        array = _deepcopy(self.array)
+        array = self.array
         for i in range(reps[0]-1):
             array += array
-        mat = Matrix(array)
+        mat = Matrix(array, _plain(self.typecode))
         if reps[1] == 0:
             return Matrix()
         mat = mat.repeat(reps[1], 1)
         return mat
 
     @classmethod
-    def zero(cls, row=3, col=3):
+    def zero(cls, row=3, col=3, typecode=None):
         """
 
         Generate a matrix filled with 0.
         """
-        array = [[0]*col]*row
-        return cls(array)
+        return cls._from_flat([0]*(row*col), (row, col), typecode)
 
     @classmethod
-    def eye(cls, n):
+    def eye(cls, n, typecode=None):
         """
 
         Generate a identity matrix.
+
+        >>> Matrix.eye(2, typecode='d')
+        [[1.0 0.0]
+         [0.0 1.0]]
         """
-        mat = cls.zero(row=n, col=n)
-        for i in range(n):
-            mat.array[i][i] = 1
+        mat = cls.zero(row=n, col=n, typecode=typecode)
+        mat._data[::n+1] = _buffer([1]*n, typecode)
         return mat
 
     @classmethod
-    def rand(cls, row, col):
+    def rand(cls, row, col, typecode=None, seed=None):
         """
 
+        :type seed: int, str, bytes, random.Random
+
         Generate a matrix filled with random number whose range is from 0 to 1.
+        The numbers are drawn from a random.Random seeded by seed, or seed itself if it is
+        a random.Random, or the global generator of the random module if it is None.
+
+        >>> Matrix.rand(2, 3, seed=1) == Matrix.rand(2, 3, seed=1)
+        True
         """
-        random.seed(time.time())
-        mat = cls.zero(row, col)
-        for i in range(row):
-            mat.array[i] = [element + random.random() for element in mat.array[i]]
-        return mat
+        draw = _rng(seed).random
+        return cls._from_flat([draw() for _ in _repeat(None, row*col)], (row, col), typecode)
+
+    @classmethod
+    def uniform(cls, row, col, low=0.0, high=1.0, typecode=None, seed=None):
+        """
+
+        Generate a matrix filled with random number whose range is from low to high.
+        The seed is used like rand.
+        """
+        draw = _rng(seed).random
+        width = high - low
+        return cls._from_flat([low + width*draw() for _ in _repeat(None, row*col)], (row, col), typecode)
+
+    @classmethod
+    def randn(cls, row, col, mean=0.0, std=1.0, typecode=None, seed=None):
+        """
+
+        Generate a matrix filled with random number of the normal distribution.
+        The seed is used like rand.
+        """
+        draw = _rng(seed).gauss
+        return cls._from_flat([draw(mean, std) for _ in _repeat(None, row*col)], (row, col), typecode)
+
+    @classmethod
+    def randint(cls, row, col, low, high, seed=None):
+        """
+
+        Generate a matrix filled with random integer from low to high, both included.
+        The seed is used like rand.
+
+        >>> m = Matrix.randint(3, 3, 1, 6, seed=2)
+        >>> 1 <= m.min() and m.max() <= 6
+        True
+        """
+        draw = _rng(seed).randrange
+        high += 1
+        return cls._from_flat([draw(low, high) for _ in _repeat(None, row*col)], (row, col))
+
+    @staticmethod
+    def random_streams(n, seed=None):
+        """
+
+        :type n: int
+        :rtype: list
+
+        Generate n independent random.Random for parallel jobs, each one is passed as the
+        seed of a job. They are seeded by the generator of seed, so the same seed gives the
+        same streams.
+
+        >>> streams = Matrix.random_streams(2, seed=7)
+        >>> Matrix.rand(1, 2, seed=streams[0]) == Matrix.rand(1, 2, seed=streams[1])
+        False
+        """
+        parent = _rng(seed)
+        return [random.Random(parent.getrandbits(128)) for _ in range(n)]
 
     def index(self, x, total=False):
         col = self.shape[1]
-        indexes = [divmod(i, col) for i, element in enumerate(self) if element == x]
         if total:
-            return indexes
-        else:
-            return indexes[0]
+            return [divmod(i, col) for i, element in enumerate(self) if element == x]
+        for i, element in enumerate(self):
+            if element == x:
+                return divmod(i, col)
+        raise IndexError("{0!r} is not in the matrix".format(x))
 
     def get(self, index):
         """
 
         :type index: tuple
         """
-        return self.array[index[0]][index[1]]
+        if isinstance(index[0], slice) or isinstance(index[1], slice):
+            return self[index]._lists()
+        i = _index_range(index[0], self.shape[0])[0]
+        j = _index_range(index[1], self.shape[1])[0]
+        return self._data[self._offset + i*self._strides[0] + j*self._strides[1]]
 
     def max(self, axis=None):
         """
@@ -718,12 +1887,15 @@ class Matrix(object):
         >>> m0.max(1)
         [[7 8 9]]
         """
+        result = Matrix.backend.reduce('max', self, axis)
+        if result is not NotImplemented:
+            return result
         if axis == 0:
-            return Matrix([[max(row) for row in self.array]]).T
+            return self._new([max(row) for row in self._rows()], (self.shape[0], 1))
         elif axis == 1:
-            return Matrix([[max(row) for row in self.transpose.array]])
+            return self._new([max(col) for col in self._cols()], (1, self.shape[1]))
         elif axis is None:
-            return max(self)
+            return max(self._values())
 
     def min(self, axis=None):
         """
@@ -743,12 +1915,15 @@ class Matrix(object):
         >>> m0.min(1)
         [[1 2 3]]
         """
+        result = Matrix.backend.reduce('min', self, axis)
+        if result is not NotImplemented:
+            return result
         if axis == 0:
-            return Matrix([[min(row) for row in self.array]]).T
+            return self._new([min(row) for row in self._rows()], (self.shape[0], 1))
         elif axis == 1:
-            return Matrix([[min(row) for row in self.transpose.array]])
+            return self._new([min(col) for col in self._cols()], (1, self.shape[1]))
         elif axis is None:
-            return min(self)
+            return min(self._values())
 
     def mean(self, axis=None):
         """
@@ -768,13 +1943,16 @@ class Matrix(object):
         >>> m0.mean(1)
         [[4.0 5.0 6.0]]
         """
+        result = Matrix.backend.reduce('mean', self, axis)
+        if result is not NotImplemented:
+            return result
         element_num = self.shape[0]*self.shape[1]
         if axis == 0:
-            return Matrix([[sum(row)/self.shape[1] for row in self.array]]).T
+            return self._new([sum(row)/self.shape[1] for row in self._rows()], (self.shape[0], 1))
         elif axis == 1:
-            return Matrix([[sum(row)/self.shape[0] for row in self.transpose.array]])
+            return self._new([sum(col)/self.shape[0] for col in self._cols()], (1, self.shape[1]))
         elif axis is None:
-            return sum([sum(row) for row in self.array])/element_num
+            return sum(self._values())/element_num
 
     def var(self, axis=None):
         """
@@ -794,13 +1972,10 @@ class Matrix(object):
         >>> m0.var(1)
         [[6.0 6.0 6.0]]
         """
-        if axis == 0:
-            return Matrix([[Matrix([row]).var() for row in self.array]]).T
-        elif axis == 1:
-            return self.transpose.var(0).T
-        elif axis is None:
-            average = self.mean()
-            return Matrix([[(x - average)**2 for x in self]]).mean()
+        result = Matrix.backend.reduce('var', self, axis)
+        if result is not NotImplemented:
+            return result
+        return self._variance(axis)
 
     def std(self, axis=None):
         """
@@ -810,12 +1985,48 @@ class Matrix(object):
         m0.std() is equal to m0.var()**0.5
         The value of the axis decides how to calculate.
         """
+        result = Matrix.backend.reduce('std', self, axis)
+        if result is not NotImplemented:
+            return result
+        var = self._variance(axis)
         if axis is None:
-            return self.var(axis)**0.5
-        elif axis == 0:
-            return Matrix([[x**0.5 for x in self.var(axis)]]).T
-        elif axis == 1:
-            return Matrix([[x**0.5 for x in self.var(axis)]])
+            return var**0.5
+        return self._new([x**0.5 for x in var._values()], var.shape)
+
+    def _variance(self, axis):
+        """
+
+        Get the variance like describe, from only the count, the mean and the M2 of each line.
+        """
+        if axis is None:
+            total, average, m2 = _merge_moments(map(_line_moments, self._rows()))
+            return m2/total
+        lines = self._rows() if axis == 0 else self._cols()
+        var = [m2/n for n, average, m2 in map(_line_moments, lines)]
+        return self._new(var, (len(var), 1) if axis == 0 else (1, len(var)))
+
+    def describe(self, axis=None):
+        """
+
+        :type axis: int
+        :rtype: dict
+
+        Get count, sum, mean, var, std, min and max of the matrix in a single pass.
+        The value of the axis decides how to calculate like the methods of the same names.
+
+        >>> m0 = Matrix([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        >>> d = m0.describe()
+        >>> d["count"], d["sum"], d["mean"], d["var"], d["min"], d["max"]
+        (9, 45, 5.0, 6.666666666666667, 1, 9)
+        >>> m0.describe(1)["std"]
+        [[2.449489742783178 2.449489742783178 2.449489742783178]]
+        """
+        if axis == 0:
+            # the columns are fed in order to get the results of each row.
+            moments = _moments(self._cols(), self.shape[0])
+        else:
+            moments = _moments(self._rows(), self.shape[1])
+        return _statistics(moments, axis, self._new)
 
     def sum(self, axis=None):
         """
@@ -834,12 +2045,15 @@ class Matrix(object):
         >>> m.sum(1)
         [[4.0 -8 10]]
         """
+        result = Matrix.backend.reduce('sum', self, axis)
+        if result is not NotImplemented:
+            return result
         if axis == 0:
-            return Matrix([[sum(row) for row in self.array]]).T
+            return self._new([sum(row) for row in self._rows()], (self.shape[0], 1))
         elif axis == 1:
-            return Matrix([[sum(row) for row in self.transpose.array]])
+            return self._new([sum(col) for col in self._cols()], (1, self.shape[1]))
         elif axis is None:
-            return sum([sum(row) for row in self.array])
+            return sum(self._values())
 
     def sort(self, axis=None, key=None, reverse=False):
         """
@@ -878,19 +2092,148 @@ class Matrix(object):
          [0 1.0 1]
          [2 4 9]]
         """
+        result = Matrix.backend.sort(self, axis, key, reverse)
+        if result is not NotImplemented:
+            self._wrap(result._data, result.shape, self.typecode, result._offset, result._strides)
+            return
         if axis is None:
-            shape = self.shape
-            self.reshape((1, self.shape[0]*self.shape[1]))
-            self.array[0].sort(key=key, reverse=reverse)
-            self.reshape(shape)
+            values = sorted(self._values(), key=key, reverse=reverse)
+            self._wrap(_buffer(values, self.typecode), self.shape, self.typecode)
         elif axis == 0:
-            for row in self.array:
-                row.sort(key=key, reverse=reverse)
+            values = _chain.from_iterable(sorted(row, key=key, reverse=reverse) for row in self._rows())
+            self._wrap(_buffer(values, self.typecode), self.shape, self.typecode)
         elif axis == 1:
-            mat = self.transpose
-            for row in mat.array:
-                row.sort(key=key, reverse=reverse)
-            self.array = mat.transpose.array
+            # keep the sorted columns in column-major order.
+            values = _chain.from_iterable(sorted(col, key=key, reverse=reverse) for col in self._cols())
+            self._wrap(_buffer(values, self.typecode), self.shape, self.typecode, 0, (1, self.shape[0]))
+
+    def argsort(self, axis=None, key=None, reverse=False):
+        """
+
+        :type axis: int
+
+        Get the indexes sorting the elements, as Matrix.sort would order them.
+        If axis is None, the indexes in row-major order of all the elements are given as a row.
+        If axis is 0, the column indexes sorting each row, 1 the row indexes sorting each column.
+
+        >>> m = Matrix([[3, 1, 2], [0, 5, 4]])
+        >>> m.argsort()
+        [[3 1 2 0 5 4]]
+        >>> m.argsort(0)
+        [[1 2 0]
+         [0 2 1]]
+        >>> m.argsort(1, reverse=True)
+        [[0 1 1]
+         [1 0 0]]
+        """
+        def indexes(line):
+            line = list(line)
+            sort_key = line.__getitem__ if key is None else lambda i: key(line[i])
+            return sorted(range(len(line)), key=sort_key, reverse=reverse)
+
+        if axis is None:
+            return Matrix._from_flat(indexes(self._values()), (1, self.shape[0]*self.shape[1]))
+        return self._apply_lines(indexes, axis, Matrix._from_flat)
+
+    def topk(self, k, axis=None, largest=True, indexes=False):
+        """
+
+        :type k: int
+        :type axis: int
+
+        Get the k largest elements, or the smallest ones if largest is False, in order by a
+        heap selection instead of a full sort. The axis decides like argsort, the results of
+        each row are a row and the results of each column are a column.
+        If indexes is True, the indexes of the elements are given instead.
+
+        >>> m = Matrix([[3, 1, 2], [0, 5, 4]])
+        >>> m.topk(2)
+        [[5 4]]
+        >>> m.topk(2, 0)
+        [[3 2]
+         [5 4]]
+        >>> m.topk(1, 1, largest=False)
+        [[0 1 2]]
+        >>> m.topk(2, 0, indexes=True)
+        [[0 2]
+         [1 2]]
+        """
+        select = heapq.nlargest if largest else heapq.nsmallest
+
+        def top(line):
+            if not indexes:
+                return select(k, line)
+            line = list(line)
+            return select(k, range(len(line)), key=line.__getitem__)
+
+        if axis is None:
+            values = top(self._values())
+            if indexes:
+                return Matrix._from_flat(values, (1, len(values)))
+            return self._new(values, (1, len(values)))
+        return self._apply_lines(top, axis, Matrix._from_flat if indexes else self._new)
+
+    def nth_element(self, n, axis=None):
+        """
+
+        :type n: int
+        :type axis: int
+
+        Get the element of rank n (from 0) in ascending order without sorting, of all the
+        elements if axis is None, of each row if axis is 0 and of each column if axis is 1.
+
+        >>> m = Matrix([[3, 1, 2], [0, 5, 4]])
+        >>> m.nth_element(0)
+        0
+        >>> m.nth_element(1, 0)
+        [[2]
+         [4]]
+        """
+        if axis is None:
+            return _select(list(self._values()), n)
+        return self._apply_lines(lambda line: _select(list(line), n), axis, self._new)
+
+    def median(self, axis=None):
+        """
+
+        :type axis: int
+
+        Get the median by selection. The value of the axis decides how to calculate.
+
+        >>> m = Matrix([[3, 1, 2], [0, 5, 4]])
+        >>> m.median()
+        2.5
+        >>> m.median(1)
+        [[1.5 3.0 3.0]]
+        """
+        if axis is None:
+            return _median(list(self._values()))
+        return self._apply_lines(lambda line: _median(list(line)), axis, Matrix._from_flat)
+
+    def partition(self, kth, axis=None):
+        """
+
+        :type kth: int
+        :type axis: int
+
+        Move the element of rank kth to the position kth, the smaller elements before it and
+        the other ones after it, without sorting them. This will change the matrix itself.
+        The value of the axis decides like sort.
+
+        >>> m = Matrix([[3, 1, 2], [0, 5, 4]])
+        >>> m.partition(1, 0)
+        >>> m[:, 1]
+        [[2]
+         [4]]
+        >>> m.partition(2)
+        >>> m[0, 2]
+        2
+        """
+        if axis is None:
+            values = _partition(list(self._values()), kth)
+        else:
+            values = self._apply_lines(lambda line: _partition(list(line), kth), axis, self._new)._values()
+        self._store(values)
 
     @classmethod
     def from_string(cls, string):
@@ -909,11 +2252,12 @@ class Matrix(object):
         return Matrix(array)
 
     @classmethod
-    def from_list(cls, array, shape):
+    def from_list(cls, array, shape, typecode=None):
         """
 
         :type array: iterable
         :type shape: tuple, list
+        :type typecode: str
 
         Generate a matrix from a one-dimensional array.
         List, tuple or generator is accepted.
@@ -929,20 +2273,133 @@ class Matrix(object):
          [2 3]
          [4 5]]
         """
-        mat = cls([array])
+        mat = cls([array], typecode)
         mat.reshape(shape)
         return mat
 
     @classmethod
-    def from_file(cls, filename):
+    def from_rows(cls, rows, typecode=None):
+        """
+
+        :type rows: iterable
+        :type typecode: str
+
+        Generate a matrix from an iterable of rows, which is consumed one row at a time.
+
+        >>> Matrix.from_rows(([x, x*x] for x in range(3)), typecode='d')
+        [[0.0 0.0]
+         [1.0 1.0]
+         [2.0 4.0]]
+        """
+        data = _buffer((), typecode)
+        count = 0
+        cols = None
+        for row in rows:
+            if cols is None:
+                cols = len(row)
+            elif len(row) != cols:
+                raise IndexError
+            data.extend(row)
+            count += 1
+        if cols is None:
+            return cls(typecode=typecode)
+        return cls.__new__(cls)._wrap(data, (count, cols), typecode)
+
+    @staticmethod
+    def iter_rows(filename, sep=';', chunk_size=1 << 20):
+        """
+
+        :type filename: str
+        :type sep: str
+        :type chunk_size: int
+
+        Read a text matrix file by chunks of chunk_size characters, and generate its rows
+        as lists of floats. The rows are separated by sep, use '\\n' for one row per line.
+
+        >>> import os, tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), "m.txt")
+        >>> Matrix([[1, 2], [3, 4]]).to_file(filename, 'T')
+        >>> list(Matrix.iter_rows(filename, chunk_size=3))
+        [[1.0, 2.0], [3.0, 4.0]]
+        >>> sum(map(sum, Matrix.iter_rows(filename)))
+        10.0
+        """
+        with open(filename, 'r', encoding="UTF-8") as file:
+            for row in _read_rows(file, sep, chunk_size):
+                yield row
+
+    @classmethod
+    def iter_blocks(cls, filename, rows=1024, sep=';', typecode=None, chunk_size=1 << 20):
+        """
+
+        :type filename: str
+        :type rows: int
+
+        Read a text matrix file and generate it as matrices of at most rows rows.
+        """
+        block = []
+        for row in cls.iter_rows(filename, sep, chunk_size):
+            block.append(row)
+            if len(block) == rows:
+                yield cls.from_rows(block, typecode)
+                block = []
+        if block:
+            yield cls.from_rows(block, typecode)
+
+    @classmethod
+    def describe_file(cls, filename, axis=None, sep=';', chunk_size=1 << 20):
+        """
+
+        :type filename: str
+        :type axis: int
+
+        Get the statistics of describe for a text matrix file, reading it in a single pass
+        without loading the matrix.
+
+        >>> import os, tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), "m.txt")
+        >>> Matrix([[1, 2], [3, 6]]).to_file(filename, 'T')
+        >>> Matrix.describe_file(filename)["mean"]
+        3.0
+        >>> Matrix.describe_file(filename, 0)["max"]
+        [[2.0]
+         [6.0]]
+        >>> Matrix.describe_file(filename, 1)["sum"]
+        [[4.0 8.0]]
+        >>> with open(filename, 'w') as file:
+        ...     _ = file.write("1;2\\n3\\n")
+        >>> Matrix.describe_file(filename, 0)
+        Traceback (most recent call last):
+        ...
+        IndexError: the lines don't have the same length
+        >>> open(filename, 'w').close()
+        >>> Matrix.describe_file(filename)
+        Traceback (most recent call last):
+        ...
+        ValueError: empty matrix file
+        """
+        rows = cls.iter_rows(filename, sep, chunk_size)
+        try:
+            first = next(rows)
+        except StopIteration:
+            raise ValueError("empty matrix file") from None
+        rows = _sized(_chain([first], rows), len(first))
+        if axis == 0:
+            # each row is small enough to be reduced on its own.
+            moments = _moments_by_line(rows, len(first))
+        else:
+            moments = _moments(rows, len(first))
+        return _statistics(moments, axis, cls._from_flat)
+
+    @classmethod
+    def from_file(cls, filename, typecode=None):
         i = filename.index('.')
         if filename[i+1:] == "json":
             return cls.mload(filename)
         elif filename[i+1:] == "txt":
-            with open(filename, 'r', encoding="UTF-8") as file:
-                strings = file.readlines()
-                string = ''.join(map(str.strip, strings))
-            return cls.from_string(string)
+            return cls.from_rows(cls.iter_rows(filename), typecode)
+        elif filename[i+1:] == "bin":
+            return cls.bload(filename)
 
     def to_string(self):
         """
@@ -959,7 +2416,11 @@ class Matrix(object):
         return ';'.join(string)
 
     def to_list(self):
-        return self.array
+        """
+
+        Get a copy of the elements as a list of lists, writing to it won't change the matrix.
+        """
+        return self._lists()
 
     def to_file(self, filename: str, mode='J'):
         if '.' in filename:
@@ -968,9 +2429,13 @@ class Matrix(object):
                 filename = filename[: i] + ".json"
             elif mode == 'T':
                 filename = filename[: i] + ".txt"
+            elif mode == 'B':
+                filename = filename[: i] + ".bin"
 
         if mode == 'J':
             self.mdump(filename)
+        elif mode == 'B':
+            self.bdump(filename)
         elif mode == 'T':
             string = self.to_string()
             strings = string.split(';')
@@ -1000,7 +2465,800 @@ class Matrix(object):
         with open(filename, 'r', encoding="UTF-8") as file:
             return cls(load(fp=file))
 
+    def bdump(self, filename):
+        """
+
+        Dump the matrix into a binary file, a header with the shape and the typecode
+        followed by the raw elements. A matrix without typecode is stored as doubles.
+
+        >>> import os, tempfile
+        >>> filename = os.path.join(tempfile.mkdtemp(), "m.bin")
+        >>> Matrix([[1, 2], [3, 4]]).bdump(filename)
+        >>> Matrix.bload(filename)
+        [[1.0 2.0]
+         [3.0 4.0]]
+        >>> m = Matrix.mmap(filename)
+        >>> m.T
+        [[1.0 3.0]
+         [2.0 4.0]]
+        """
+        typecode = self.typecode or 'd'
+        data = _array(typecode, self._values())
+        if sys.byteorder == "big":
+            data.byteswap()
+        with open(filename, 'wb') as file:
+            file.write(_HEADER.pack(_MAGIC, 1, typecode.encode(), self.shape[0], self.shape[1]))
+            data.tofile(file)
+
+    @staticmethod
+    def _read_header(file):
+        magic, version, typecode, rows, cols = _HEADER.unpack(file.read(_HEADER.size))
+        if magic != _MAGIC or version != 1:
+            raise ValueError("invalid binary matrix file")
+        return typecode.decode(), (rows, cols)
+
+    @classmethod
+    def bload(cls, filename):
+        """
+
+        Load the matrix in a binary file into memory.
+        """
+        with open(filename, 'rb') as file:
+            typecode, shape = cls._read_header(file)
+            data = _array(typecode)
+            data.fromfile(file, shape[0]*shape[1])
+        if sys.byteorder == "big":
+            data.byteswap()
+        return cls.__new__(cls)._wrap(data, shape, typecode)
+
+    @classmethod
+    def mmap(cls, filename):
+        """
+
+        Map a binary file read-only into a matrix, so the elements are read from the file
+        only when they are used. Writing to the matrix copies it into memory first.
+        """
+        if sys.byteorder == "big":
+            return cls.bload(filename)
+        with open(filename, 'rb') as file:
+            typecode, shape = cls._read_header(file)
+            buffer = _mmap.mmap(file.fileno(), 0, access=_mmap.ACCESS_READ)
+        data = memoryview(buffer)[_HEADER.size: _HEADER.size + shape[0]*shape[1]*_array(typecode).itemsize]
+        return cls.__new__(cls)._wrap(data.cast(typecode), shape, typecode, cow=True)
+
+    @classmethod
+    def register_backend(cls, backend):
+        """
+
+        :type backend: Backend
+
+        Make the backend selectable by its name.
+        """
+        cls.backends[backend.name] = backend
+
+    @classmethod
+    def set_backend(cls, name):
+        """
+
+        :type name: str
+
+        Select the backend running the kernels of all matrices, "python" or "numpy".
+        The pure-Python code is used when the backend is not available.
+
+        >>> Matrix.set_backend("python")
+        >>> Matrix.backend.name
+        'python'
+        """
+        try:
+            backend = cls.backends[name]
+        except KeyError:
+            raise ValueError("unknown backend {0}".format(name))
+        if not backend.available:
+            warnings.warn("backend {0} is not available, use python instead".format(name), RuntimeWarning)
+            backend = cls.backends["python"]
+        cls.backend = backend
+
     # The following is class attributes
     I = __solve_i
     T = transpose
     print_all = False  # decide whether displaying the full matrix.
+    tile_size = 64  # number of columns in a block of the multiplication.
+    backends = {}  # backends registered by name.
+    backend = None  # the backend in use.
+
+
+class LU(object):
+    """
+
+    :type mat: Matrix
+
+    The LU factorization with partial pivoting of a matrix, P*A = L*U.
+    L and U are kept together in one array, the multipliers of L below the main diagonal.
+    It answers det, inv, rank and solve without factorizing the matrix again.
+
+    >>> lu = LU(Matrix([[1, 2], [3, 4]]))
+    >>> lu.P
+    [[0 1]
+     [1 0]]
+    >>> lu.L
+    [[1 0]
+     [0.3333333333333333 1]]
+    >>> lu.U
+    [[3 4]
+     [0 0.6666666666666667]]
+    >>> lu.solve(Matrix([[5, 1], [11, 2]]))
+    [[1.0 0.0]
+     [2.0 0.5]]
+    >>> LU(Matrix([[1, 2], [2, 4]])).rank
+    1
+    >>> lu = LU(Matrix([[1, 2, 3], [4, 5, 6], [7, 8, 9]]))
+    >>> lu.rank, lu.singular, lu.det, lu.inv()
+    (2, True, 0, None)
+    >>> LU(Matrix([[1e20, 0], [0, 1e-5]])).singular
+    False
+    """
+
+    def __init__(self, mat):
+        self.shape = mat.shape
+        self.typecode = _plain(mat.typecode)
+        rows, cols = mat.shape
+        array = mat._lists() if rows else []
+        # the same pivots decide rank, det, inv and solve, the tolerance is relative to
+        # each row so that a badly scaled but regular matrix keeps all its pivots.
+        self.tolerance = _pivot_tolerance(mat.shape)
+        self.array, self.perm, self.sign, self.pivots = _eliminate(array, self.tolerance)
+
+    @property
+    def rank(self):
+        """
+
+        The number of pivots, see _eliminate.
+        """
+        return len(self.pivots)
+
+    @property
+    def singular(self):
+        return self.shape[0] != self.shape[1] or len(self.pivots) < self.shape[0]
+
+    @property
+    def det(self):
+        if self.shape[0] != self.shape[1]:
+            raise IndexError("square matrix expected")
+        if self.singular:
+            return 0
+        if not self.shape[0]:
+            return 1
+        main_diagonal = [self.array[i][i] for i in range(self.shape[0])]
+        return reduce(lambda x, y: x*y, main_diagonal)*self.sign
+
+    @property
+    def L(self):
+        n = self.shape[0]
+        return Matrix([[self.array[i][j] if j < i else int(i == j) for j in range(n)] for i in range(n)])
+
+    @property
+    def U(self):
+        return Matrix([[x if j >= i else 0 for j, x in enumerate(row)] for i, row in enumerate(self.array)])
+
+    @property
+    def P(self):
+        n = self.shape[0]
+        return Matrix([[int(self.perm[i] == j) for j in range(n)] for i in range(n)])
+
+    def solve(self, b):
+        """
+
+        :type b: Matrix
+
+        Solve A*X = b, a column of b for each right-hand side.
+        """
+        if self.shape[0] != self.shape[1]:
+            raise IndexError("square matrix expected")
+        if b.shape[0] != self.shape[0]:
+            raise IndexError("b should have {0} rows".format(self.shape[0]))
+        if self.singular:
+            raise ZeroDivisionError("singular matrix")
+
+        x = [list(b._row(i)) for i in self.perm]
+        x = _substitute(self.array, x, True, unit=True)
+        x = _substitute(self.array, x, False)
+        return Matrix(x, _plain(b.typecode))
+
+    def inv(self):
+        """
+
+        Get the inverse matrix, None for a singular matrix.
+        """
+        if self.singular:
+            return None
+        return self.solve(Matrix.eye(self.shape[0], self.typecode))
+
+
+class Expression(object):
+    """
+
+    A lazy elementwise expression of matrices of the same shape and numbers.
+    Nothing is computed until evaluate(), which compiles the whole expression into one
+    function and maps it over the elements of the matrices, so no temporary matrix is made.
+    As for Matrix, * is the matrix product when both operands are matrices, which is
+    computed at once; use pw_product for the elementwise product.
+
+    >>> a = Matrix([[1, 2], [3, 4]])
+    >>> e = abs(-a.lazy()).pw_product(a) / 2 + 1
+    >>> e
+    Expression((((abs((-x0)) * x0) / c0) + c1), shape=(2, 2))
+    >>> e.evaluate()
+    [[1.5 3.0]
+     [5.5 9.0]]
+    >>> (a / (a.lazy() + 1)).evaluate()
+    [[0.5 0.6666666666666666]
+     [0.75 0.8]]
+    >>> Matrix.pw_product(a, a.lazy() % 3)
+    Expression((x0 * (x0 % c0)), shape=(2, 2))
+    """
+    _binary = {_add: '+', _sub: '-', _mul: '*', _floordiv: '//', _mod: '%'}
+
+    def __init__(self, op, *args):
+        self.op = op
+        self.args = args
+        matrices = [x.shape for x in args if isinstance(x, (Matrix, Expression))]
+        if len(set(matrices)) > 1:
+            raise IndexError("two mats don't have the same shape.")
+        self.shape = matrices[0]
+
+    def __repr__(self):
+        return "Expression({0}, shape={1})".format(self._code([], {}), self.shape)
+
+    def _code(self, matrices, constants):
+        """
+
+        Generate the code of the expression, the matrices are named x0, x1, ... and the
+        numbers c0, c1, ... in the order they are found.
+        """
+        if self.op is None:
+            return self._name(self.args[0], matrices, constants)
+        args = [x._code(matrices, constants) if isinstance(x, Expression) else self._name(x, matrices, constants)
+                for x in self.args]
+        if self.op in Expression._binary:
+            return "({0} {1} {2})".format(args[0], Expression._binary[self.op], args[1])
+        if self.op is _truediv:
+            return "({0} / {1})".format(*args)
+        if self.op is _neg:
+            return "(-{0})".format(*args)
+        return "{0}({1})".format(self.op.__name__, ', '.join(args))
+
+    @staticmethod
+    def _name(x, matrices, constants):
+        if isinstance(x, Matrix):
+            for i, mat in enumerate(matrices):
+                if mat is x:
+                    return "x{0}".format(i)
+            matrices.append(x)
+            return "x{0}".format(len(matrices) - 1)
+        name = "c{0}".format(len(constants))
+        constants[name] = x
+        return name
+
+    def evaluate(self):
+        """
+
+        :rtype: Matrix
+
+        Compute the expression in a single pass over the elements.
+        """
+        matrices, constants = [], {}
+        code = self._code(matrices, constants)
+        names = ', '.join("x{0}".format(i) for i in range(len(matrices)))
+        constants.update({"abs": abs, "floor": math.floor, "ceil": math.ceil})
+        func = eval("lambda {0}: {1}".format(names, code), constants)
+        return matrices[0]._new(map(func, *[mat._values() for mat in matrices]), self.shape)
+
+    def __add__(self, other):
+        return Expression(_add, self, other)
+
+    def __radd__(self, other):
+        return Expression(_add, other, self)
+
+    def __sub__(self, other):
+        return Expression(_sub, self, other)
+
+    def __rsub__(self, other):
+        return Expression(_sub, other, self)
+
+    def __mul__(self, other):
+        if isinstance(other, (Matrix, Expression)):
+            if isinstance(other, Expression):
+                other = other.evaluate()
+            return (self.evaluate()*other).lazy()
+        return Expression(_mul, self, other)
+
+    def __rmul__(self, other):
+        if isinstance(other, Matrix):
+            return (other*self.evaluate()).lazy()
+        return Expression(_mul, other, self)
+
+    def __truediv__(self, other):
+        return Expression(_truediv, self, other)
+
+    def __rtruediv__(self, other):
+        return Expression(_truediv, other, self)
+
+    def __floordiv__(self, other):
+        return Expression(_floordiv, self, other)
+
+    def __rfloordiv__(self, other):
+        return Expression(_floordiv, other, self)
+
+    def __mod__(self, other):
+        return Expression(_mod, self, other)
+
+    def __rmod__(self, other):
+        return Expression(_mod, other, self)
+
+    def __neg__(self):
+        return Expression(_neg, self)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Expression(abs, self)
+
+    def __floor__(self):
+        return Expression(math.floor, self)
+
+    def __ceil__(self):
+        return Expression(math.ceil, self)
+
+    def pw_product(self, other):
+        """
+
+        The elementwise product, see Matrix.pw_product.
+        """
+        return Expression(_mul, self, other)
+
+
+class Backend(object):
+    """
+
+    The kernels of the matrix operations.
+    A kernel returning NotImplemented lets Matrix run its own pure-Python code,
+    which is all this backend does.
+    """
+    name = "python"
+    available = True
+
+    def elementwise(self, op, mat, other=None):
+        """
+
+        Apply op to the elements of mat and other, a matrix, a number or None for unary op.
+        """
+        return NotImplemented
+
+    def matmul(self, mat1, mat2):
+        return NotImplemented
+
+    def inv(self, mat):
+        return NotImplemented
+
+    def det(self, mat):
+        return NotImplemented
+
+    def rank(self, mat):
+        return NotImplemented
+
+    def solve(self, a, b):
+        return NotImplemented
+
+    def lstsq(self, a, b):
+        """
+
+        Solve a*x = b for a non-square a in the least-squares sense, see Matrix.solve.
+        """
+        return NotImplemented
+
+    def reduce(self, name, mat, axis=None):
+        """
+
+        :type name: str
+
+        Run the reduction name, one of sum, mean, var, std, max and min.
+        """
+        return NotImplemented
+
+    def sort(self, mat, axis=None, key=None, reverse=False):
+        """
+
+        Return a sorted copy of mat.
+        """
+        return NotImplemented
+
+
+class NumpyBackend(Backend):
+    """
+
+    The kernels running on numpy.ndarray.
+    Matrices stored with a typecode are viewed by numpy without a copy. Matrices stored
+    in lists are converted only when they hold only floats; integers are left to the
+    pure-Python code, which keeps them exact instead of overflowing int64.
+    Floats follow IEEE 754 like the pure-Python code: overflow gives inf and invalid
+    operations give nan, while a division by zero raises ZeroDivisionError.
+    """
+    name = "numpy"
+    available = _np is not None
+
+    _unary = {}
+    if available:
+        _unary = {
+            abs: _np.abs,
+            _neg: _np.negative,
+            math.floor: _np.floor,
+            math.ceil: _np.ceil,
+        }
+
+    @staticmethod
+    def _run(func, *args):
+        """
+
+        Call func with the floating point errors of numpy ignored, except a zero divisor,
+        which raises ZeroDivisionError as Python floats do, 0/0 included.
+        """
+        if func in (_truediv, _floordiv, _mod) and not _np.all(args[1]):
+            raise ZeroDivisionError("division by zero")
+        with _np.errstate(all='ignore'):
+            return func(*args)
+
+    @staticmethod
+    def _to_ndarray(mat):
+        if mat.shape[0]*mat.shape[1] == 0 or mat.typecode == _MASK:
+            return None
+        if mat.typecode is None:
+            if set(map(type, mat._values())) != {float}:
+                return None
+            return _np.array(mat.array)
+        arr = _np.frombuffer(mat._data, dtype=mat.typecode)
+        size = arr.itemsize
+        return _np.lib.stride_tricks.as_strided(arr[mat._offset:], mat.shape,
+                                                (mat._strides[0]*size, mat._strides[1]*size),
+                                                writeable=False)
+
+    @staticmethod
+    def _to_matrix(arr, typecode=None):
+        if arr.ndim < 2:
+            arr = arr.reshape((1, -1))
+        if typecode is None:
+            return Matrix._from_flat(arr.ravel().tolist(), arr.shape)
+        data = _array(typecode)
+        data.frombytes(_np.ascontiguousarray(arr, dtype=typecode).tobytes())
+        return Matrix.__new__(Matrix)._wrap(data, arr.shape, typecode)
+
+    def elementwise(self, op, mat, other=None):
+        arr = self._to_ndarray(mat)
+        if arr is None:
+            return NotImplemented
+        if other is None:
+            if op not in self._unary:
+                return NotImplemented
+            if op in (math.floor, math.ceil) and mat.typecode is None:
+                # math.floor gives exact integers, not floats.
+                return NotImplemented
+            return self._to_matrix(self._run(self._unary[op], arr), mat.typecode)
+        if isinstance(other, Matrix):
+            if other.shape != mat.shape:
+                return NotImplemented
+            other = self._to_ndarray(other)
+            if other is None:
+                return NotImplemented
+        elif not isinstance(other, (int, float)):
+            return NotImplemented
+        return self._to_matrix(self._run(op, arr, other), mat.typecode)
+
+    def matmul(self, mat1, mat2):
+        arr1, arr2 = self._to_ndarray(mat1), self._to_ndarray(mat2)
+        if arr1 is None or arr2 is None:
+            return NotImplemented
+        return self._to_matrix(self._run(_np.matmul, arr1, arr2), mat1.typecode)
+
+    def inv(self, mat):
+        arr = self._to_ndarray(mat)
+        if arr is None:
+            return NotImplemented
+        try:
+            return self._to_matrix(self._run(_np.linalg.inv, arr), mat.typecode)
+        except _np.linalg.LinAlgError:
+            return None
+
+    def det(self, mat):
+        arr = self._to_ndarray(mat)
+        if arr is None:
+            return NotImplemented
+        return self._run(_np.linalg.det, arr).item()
+
+    def rank(self, mat):
+        arr = self._to_ndarray(mat)
+        if arr is None:
+            return NotImplemented
+        return int(_np.linalg.matrix_rank(arr))
+
+    def solve(self, a, b):
+        arr1, arr2 = self._to_ndarray(a), self._to_ndarray(b)
+        if arr1 is None or arr2 is None:
+            return NotImplemented
+        try:
+            return self._to_matrix(self._run(_np.linalg.solve, arr1, arr2), b.typecode)
+        except _np.linalg.LinAlgError:
+            raise ZeroDivisionError("singular matrix")
+
+    def lstsq(self, a, b):
+        arr1, arr2 = self._to_ndarray(a), self._to_ndarray(b)
+        if arr1 is None or arr2 is None:
+            return NotImplemented
+        x, residuals, rank, values = self._run(_np.linalg.lstsq, arr1, arr2, None)
+        if rank < min(a.shape):
+            raise ZeroDivisionError("singular matrix")
+        return self._to_matrix(x, b.typecode)
+
+    def reduce(self, name, mat, axis=None):
+        arr = self._to_ndarray(mat)
+        if arr is None:
+            return NotImplemented
+        # axis 0 of Matrix reduces each row, which is axis 1 of numpy.
+        if axis is None:
+            return self._run(getattr(arr, name)).item()
+        result = self._run(getattr(arr, name), 1-axis)
+        if axis == 0:
+            result = result.reshape((-1, 1))
+        return self._to_matrix(result, mat.typecode)
+
+    def sort(self, mat, axis=None, key=None, reverse=False):
+        arr = self._to_ndarray(mat)
+        if arr is None or key is not None:
+            return NotImplemented
+        if axis is None:
+            result = _np.sort(arr, axis=None).reshape(arr.shape)
+            if reverse:
+                result = result.ravel()[::-1].reshape(arr.shape)
+        else:
+            result = _np.sort(arr, axis=1-axis)
+            if reverse:
+                result = _np.flip(result, axis=1-axis)
+        return self._to_matrix(result, mat.typecode)
+
+
+def _attach(name):
+    """
+
+    Attach a shared block of doubles created by ProcessBackend.
+    """
+    shm = _shared_memory.SharedMemory(name=name)
+    return shm, shm.buf.cast('d')
+
+
+def _detach(shm, *views):
+    for view in views:
+        view.release()
+    shm.close()
+
+
+def _matmul_rows(a_name, b_name, out_name, shape, start, stop, tile):
+    """
+
+    Compute the rows from start to stop of the product of the shared matrices,
+    whose shapes are (n, k) and (k, m).
+    """
+    n, k, m = shape
+    a_shm, a = _attach(a_name)
+    b_shm, b = _attach(b_name)
+    out_shm, out = _attach(out_name)
+    try:
+        rows = [a[i*k: (i+1)*k].tolist() for i in range(start, stop)]
+        cols = [b[j::m].tolist() for j in range(m)]
+        out[start*m: stop*m] = _array('d', _matmul(rows, cols, tile))
+    finally:
+        _detach(a_shm, a)
+        _detach(b_shm, b)
+        _detach(out_shm, out)
+
+
+def _elementwise_rows(op, a_name, b_name, scalar, out_name, cols, start, stop):
+    """
+
+    Apply op to the rows from start to stop of the shared matrix and the other shared
+    matrix, or the scalar when b_name is None.
+    """
+    a_shm, a = _attach(a_name)
+    out_shm, out = _attach(out_name)
+    b_shm = b = None
+    try:
+        x = a[start*cols: stop*cols].tolist()
+        if b_name is None:
+            values = [op(element, scalar) for element in x]
+        else:
+            b_shm, b = _attach(b_name)
+            values = list(map(op, x, b[start*cols: stop*cols].tolist()))
+        out[start*cols: stop*cols] = _array('d', values)
+    finally:
+        _detach(a_shm, a)
+        _detach(out_shm, out)
+        if b_shm is not None:
+            _detach(b_shm, b)
+
+
+def _reduce_rows(name, a_name, shape, start, stop, axis):
+    """
+
+    Reduce the rows from start to stop of the shared matrix.
+    For axis 0 it returns the result of each row. For axis 1 it returns the partial
+    result of each column, (count, mean, sum of squared deviations) for var and std.
+    """
+    rows, cols = shape
+    a_shm, a = _attach(a_name)
+    try:
+        if axis == 0:
+            lines = [a[i*cols: (i+1)*cols].tolist() for i in range(start, stop)]
+        else:
+            lines = [a[start*cols + j: stop*cols: cols].tolist() for j in range(cols)]
+    finally:
+        _detach(a_shm, a)
+
+    if name in ("max", "min", "sum"):
+        func = {"max": max, "min": min, "sum": sum}[name]
+        return [func(line) for line in lines]
+    result = list(map(_line_moments, lines))
+    if axis == 1:
+        return result
+    if name == "mean":
+        return [average for n, average, m2 in result]
+    if name == "var":
+        return [m2/n for n, average, m2 in result]
+    return [(m2/n)**0.5 for n, average, m2 in result]
+
+
+class ProcessBackend(Backend):
+    """
+
+    :type workers: int
+    :type min_size: int
+
+    The kernels partitioning the rows of large matrices across a pool of worker processes.
+    The operands are copied once into shared memory as doubles, so they aren't pickled for
+    each task, and the workers write the result into another shared block.
+    Only matrices of floats, or stored with a typecode, with at least min_size elements
+    are handled here. It covers __mul__, pw_product, __add__ and the reductions along an axis.
+
+    >>> m = Matrix([[1.0, 2.0], [3.0, 4.0]])
+    >>> backend = ProcessBackend(workers=2, min_size=1)
+    >>> backend.matmul(m, m)
+    [[7.0 10.0]
+     [15.0 22.0]]
+    >>> backend.reduce('var', m, 1)
+    [[1.0 1.0]]
+    >>> backend.close()
+    """
+    name = "process"
+    available = True
+
+    def __init__(self, workers=None, min_size=2**16):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_size = min_size
+        self._pool = None
+
+    @property
+    def pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        return self._pool
+
+    def close(self):
+        """
+
+        Shut down the worker processes. The pool is started again when needed.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _accepts(self, mat):
+        if mat.shape[0]*mat.shape[1] < self.min_size:
+            return False
+        if mat.typecode == _MASK:
+            return False
+        return mat.typecode is not None or set(map(type, mat._values())) == {float}
+
+    def _chunks(self, rows):
+        step = -(-rows // self.workers)
+        return [(start, min(start + step, rows)) for start in range(0, rows, step)]
+
+    @staticmethod
+    def _share(mat=None, size=None):
+        if mat is not None:
+            size = mat.shape[0]*mat.shape[1]
+        shm = _shared_memory.SharedMemory(create=True, size=max(size, 1)*8)
+        if mat is not None:
+            view = shm.buf.cast('d')
+            view[: size] = _array('d', mat._values())
+            view.release()
+        return shm
+
+    @staticmethod
+    def _result(shm, shape, typecode):
+        view = shm.buf.cast('d')
+        data = _array('d', view[: shape[0]*shape[1]])
+        view.release()
+        return Matrix._from_flat(data if typecode == 'd' else data.tolist(), shape, typecode)
+
+    def matmul(self, mat1, mat2):
+        if not (self._accepts(mat1) and self._accepts(mat2)):
+            return NotImplemented
+        shape = (mat1.shape[0], mat2.shape[1])
+        blocks = [self._share(mat1), self._share(mat2), self._share(size=shape[0]*shape[1])]
+        try:
+            futures = [self.pool.submit(_matmul_rows, blocks[0].name, blocks[1].name, blocks[2].name,
+                                        (mat1.shape[0], mat1.shape[1], mat2.shape[1]), start, stop,
+                                        Matrix.tile_size)
+                       for start, stop in self._chunks(shape[0])]
+            for future in futures:
+                future.result()
+            return self._result(blocks[2], shape, mat1.typecode)
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    def elementwise(self, op, mat, other=None):
+        if op not in (_add, _mul) or not self._accepts(mat):
+            return NotImplemented
+        blocks = [self._share(mat), self._share(size=mat.shape[0]*mat.shape[1])]
+        b_name, scalar = None, other
+        try:
+            if isinstance(other, Matrix):
+                if other.shape != mat.shape or not self._accepts(other):
+                    return NotImplemented
+                blocks.append(self._share(other))
+                b_name, scalar = blocks[2].name, None
+            elif not isinstance(other, (int, float)):
+                return NotImplemented
+            futures = [self.pool.submit(_elementwise_rows, op, blocks[0].name, b_name, scalar,
+                                        blocks[1].name, mat.shape[1], start, stop)
+                       for start, stop in self._chunks(mat.shape[0])]
+            for future in futures:
+                future.result()
+            return self._result(blocks[1], mat.shape, mat.typecode)
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    def reduce(self, name, mat, axis=None):
+        if axis is None or not self._accepts(mat):
+            return NotImplemented
+        shm = self._share(mat)
+        try:
+            futures = [self.pool.submit(_reduce_rows, name, shm.name, mat.shape, start, stop, axis)
+                       for start, stop in self._chunks(mat.shape[0])]
+            parts = [future.result() for future in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+
+        if axis == 0:
+            return mat._new(_chain.from_iterable(parts), (mat.shape[0], 1))
+        if name in ("max", "min", "sum"):
+            func = {"max": max, "min": min, "sum": sum}[name]
+            return mat._new([func(col) for col in zip(*parts)], (1, mat.shape[1]))
+        values = []
+        for col in zip(*parts):
+            n, average, m2 = _merge_moments(col)
+            if name == "mean":
+                values.append(average)
+            elif name == "var":
+                values.append(m2/n)
+            else:
+                values.append((m2/n)**0.5)
+        return mat._new(values, (1, mat.shape[1]))
+
+
+Matrix.register_backend(Backend())
+Matrix.register_backend(NumpyBackend())
+Matrix.register_backend(ProcessBackend())
+Matrix.set_backend("python")
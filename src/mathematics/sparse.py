@@ -0,0 +1,309 @@
+from array import array as _array
+from bisect import bisect_left
+from itertools import chain as _chain
+
+from matrix import Matrix, _buffer, _index_range, _plain
+
+
+__all__ = ["SparseMatrix"]
+
+
+def _indexes(values):
+    return _array('q', values)
+
+
+class SparseMatrix(object):
+    """
+
+    A matrix storing only its non-zero elements, in the compressed sparse row (CSR) format.
+    The column indexes and the values of row i are indices[indptr[i]: indptr[i+1]] and
+    data[indptr[i]: indptr[i+1]], the columns in ascending order.
+    The values are kept in a list, or in an array if a typecode is given like Matrix.
+
+    >>> s = SparseMatrix.from_coo([0, 1, 2, 0], [0, 2, 1, 0], [1, 2, 3, 4], (3, 3))
+    >>> s
+    SparseMatrix((3, 3), nnz=3)
+    (0, 0) 5
+    (1, 2) 2
+    (2, 1) 3
+    >>> s.to_matrix()
+    [[5 0 0]
+     [0 0 2]
+     [0 3 0]]
+    """
+
+    def __init__(self, data, indices, indptr, shape, typecode=None):
+        if len(indptr) != shape[0] + 1 or len(data) != len(indices) or indptr[-1] != len(data):
+            raise IndexError("invalid CSR arrays")
+        self.typecode = typecode
+        self.data = _buffer(data, typecode)
+        self.indices = _indexes(indices)
+        self.indptr = _indexes(indptr)
+        self.shape = tuple(shape)
+
+    def __str__(self):
+        string = ["SparseMatrix({0}, nnz={1})".format(self.shape, self.nnz)]
+        for i, j, value in self.items():
+            string.append("({0}, {1}) {2}".format(i, j, value))
+        return '\n'.join(string) + '\n'
+
+    def __repr__(self):
+        tmp = str(self)
+        return tmp[: len(tmp)-1]
+
+    def __getitem__(self, item):
+        """
+
+        >>> s = SparseMatrix.from_matrix(Matrix([[0, 1], [2, 0]]))
+        >>> s[0, 1], s[1, 1], s[-1, 0]
+        (1, 0, 2)
+        >>> s[:, 0]
+        Traceback (most recent call last):
+         ...
+        TypeError: SparseMatrix only supports integer indexes, not slices
+        """
+        if isinstance(item[0], slice) or isinstance(item[1], slice):
+            raise TypeError("SparseMatrix only supports integer indexes, not slices")
+        i = _index_range(item[0], self.shape[0])[0]
+        j = _index_range(item[1], self.shape[1])[0]
+        start, stop = self.indptr[i], self.indptr[i+1]
+        p = bisect_left(self.indices, j, start, stop)
+        if p < stop and self.indices[p] == j:
+            return self.data[p]
+        return 0
+
+    @property
+    def nnz(self):
+        """
+
+        Get the number of stored elements.
+        """
+        return len(self.data)
+
+    def _row(self, i):
+        start, stop = self.indptr[i], self.indptr[i+1]
+        return zip(self.indices[start: stop], self.data[start: stop])
+
+    def items(self):
+        """
+
+        Generate (i, j, value) of the stored elements, row by row.
+        """
+        for i in range(self.shape[0]):
+            for j, value in self._row(i):
+                yield i, j, value
+
+    @classmethod
+    def _from_rows(cls, rows, shape, typecode=None):
+        """
+
+        Generate a sparse matrix from a list of rows of (column, value) pairs sorted by column.
+        """
+        indptr = [0]
+        for row in rows:
+            indptr.append(indptr[-1] + len(row))
+        indices = [j for row in rows for j, value in row]
+        data = [value for row in rows for j, value in row]
+        return cls(data, indices, indptr, shape, typecode)
+
+    @classmethod
+    def from_coo(cls, rows, cols, values, shape, typecode=None):
+        """
+
+        :type rows: iterable
+        :type cols: iterable
+        :type values: iterable
+        :type shape: tuple, list
+
+        Generate a sparse matrix from the coordinate (COO) format, three sequences of
+        row indexes, column indexes and values. Duplicate entries are summed and zeros dropped.
+        """
+        lines = [{} for _ in range(shape[0])]
+        for i, j, value in zip(rows, cols, values):
+            if not (0 <= i < shape[0] and 0 <= j < shape[1]):
+                raise IndexError("index out of range")
+            line = lines[i]
+            line[j] = line.get(j, 0) + value
+        lines = [sorted((j, value) for j, value in line.items() if value) for line in lines]
+        return cls._from_rows(lines, shape, typecode)
+
+    @classmethod
+    def from_matrix(cls, mat):
+        """
+
+        :type mat: Matrix
+        """
+        rows = [[(j, x) for j, x in enumerate(row) if x] for row in mat._rows()]
+        return cls._from_rows(rows, mat.shape, _plain(mat.typecode))
+
+    def to_matrix(self, typecode=None):
+        """
+
+        Generate the dense matrix, with the typecode of self if typecode is None.
+
+        >>> SparseMatrix.from_matrix(Matrix([[1, 0], [0, 2]], 'd')).to_matrix()
+        [[1.0 0.0]
+         [0.0 2.0]]
+        """
+        values = [0]*(self.shape[0]*self.shape[1])
+        for i, j, value in self.items():
+            values[i*self.shape[1] + j] = value
+        return Matrix._from_flat(values, self.shape, typecode or self.typecode)
+
+    @property
+    def transpose(self):
+        """
+
+        :rtype: SparseMatrix
+
+        >>> SparseMatrix.from_matrix(Matrix([[1, 0, 2], [0, 3, 0]])).T.to_matrix()
+        [[1 0]
+         [0 3]
+         [2 0]]
+        """
+        rows, cols = self.shape
+        indptr = [0]*(cols+1)
+        for j in self.indices:
+            indptr[j+1] += 1
+        for j in range(cols):
+            indptr[j+1] += indptr[j]
+
+        position = indptr[: cols]
+        indices = [0]*self.nnz
+        data = [0]*self.nnz
+        for i in range(rows):
+            for j, value in self._row(i):
+                p = position[j]
+                indices[p] = i
+                data[p] = value
+                position[j] += 1
+        return SparseMatrix(data, indices, indptr, (cols, rows), self.typecode)
+
+    def __neg__(self):
+        return -1*self
+
+    def __add__(self, other):
+        """
+
+        The sum of two sparse matrices is sparse, the sum with a dense matrix or a number is dense.
+
+        >>> s = SparseMatrix.from_matrix(Matrix([[1, 0], [0, 2]]))
+        >>> (s + s.T*2).to_matrix()
+        [[3 0]
+         [0 6]]
+        >>> s + Matrix([[1, 1], [1, 1]])
+        [[2 1]
+         [1 3]]
+        >>> s + 1
+        [[2 1]
+         [1 3]]
+        >>> (Matrix([[1, 2], [3, 4]]) > 2) + s
+        [[1 0]
+         [1 3]]
+        """
+        if isinstance(other, (int, float)):
+            return self.to_matrix() + other
+        if not isinstance(other, (SparseMatrix, Matrix)):
+            return NotImplemented
+        if self.shape != other.shape:
+            raise IndexError("two mats don't have the same shape.")
+        if isinstance(other, Matrix):
+            return other + self.to_matrix(_plain(other.typecode))
+
+        rows = []
+        for i in range(self.shape[0]):
+            line = dict(self._row(i))
+            for j, value in other._row(i):
+                line[j] = line.get(j, 0) + value
+            rows.append(sorted((j, value) for j, value in line.items() if value))
+        return SparseMatrix._from_rows(rows, self.shape, self.typecode)
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return other + (-self)
+
+    def __mul__(self, other):
+        """
+
+        >>> s = SparseMatrix.from_matrix(Matrix([[1, 0], [0, 2]]))
+        >>> s * Matrix([[1, 2], [3, 4]])
+        [[1 2]
+         [6 8]]
+        >>> Matrix([[1, 2], [3, 4]]) * s
+        [[1 4]
+         [3 8]]
+        >>> (s * s).to_matrix()
+        [[1 0]
+         [0 4]]
+        >>> (s * 0).nnz
+        0
+        """
+        if isinstance(other, SparseMatrix):
+            return self._mul_sparse(other)
+        if isinstance(other, Matrix):
+            return self._mul_dense(other)
+        # the zeros made by the product are dropped as in from_coo.
+        rows = [[(j, x) for j, x in ((j, other*value) for j, value in self._row(i)) if x]
+                for i in range(self.shape[0])]
+        return SparseMatrix._from_rows(rows, self.shape, self.typecode)
+
+    def __rmul__(self, other):
+        if isinstance(other, Matrix):
+            # a*s = (s.T*a.T).T
+            return self.T._mul_dense(other.T).T
+        return self*other
+
+    def _mul_dense(self, mat):
+        if self.shape[1] != mat.shape[0]:
+            raise IndexError
+        cols = mat.shape[1]
+        dense_rows = [list(row) for row in mat._rows()]
+        values = []
+        for i in range(self.shape[0]):
+            line = [0]*cols
+            for k, a in self._row(i):
+                line = list(map(lambda x, y: x + a*y, line, dense_rows[k]))
+            values.append(line)
+        return Matrix._from_flat(_chain.from_iterable(values), (self.shape[0], cols), _plain(mat.typecode))
+
+    def _mul_sparse(self, other):
+        if self.shape[1] != other.shape[0]:
+            raise IndexError
+        rows = []
+        for i in range(self.shape[0]):
+            line = {}
+            for k, a in self._row(i):
+                for j, b in other._row(k):
+                    line[j] = line.get(j, 0) + a*b
+            rows.append(sorted((j, value) for j, value in line.items() if value))
+        return SparseMatrix._from_rows(rows, (self.shape[0], other.shape[1]), self.typecode)
+
+    def sum(self, axis=None):
+        """
+
+        The value of the axis decides how to calculate like Matrix.sum.
+
+        >>> s = SparseMatrix.from_matrix(Matrix([[1, 0, 2], [0, 3, 0]]))
+        >>> s.sum()
+        6
+        >>> s.sum(0)
+        [[3]
+         [3]]
+        >>> s.sum(1)
+        [[1 3 2]]
+        """
+        if axis == 0:
+            sums = [sum(self.data[self.indptr[i]: self.indptr[i+1]]) for i in range(self.shape[0])]
+            return Matrix._from_flat(sums, (self.shape[0], 1), self.typecode)
+        elif axis == 1:
+            sums = [0]*self.shape[1]
+            for j, value in zip(self.indices, self.data):
+                sums[j] += value
+            return Matrix._from_flat(sums, (1, self.shape[1]), self.typecode)
+        elif axis is None:
+            return sum(self.data)
+
+    T = transpose